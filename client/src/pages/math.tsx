@@ -1,4 +1,4 @@
-import { useState, useRef, useCallback } from "react";
+import { useState, useRef, useCallback, useEffect } from "react";
 import { Link } from "wouter";
 import { motion, AnimatePresence } from "framer-motion";
 import { useMutation } from "@tanstack/react-query";
@@ -94,6 +94,7 @@ export default function MathPage() {
   const [parseError, setParseError] = useState<string | null>(null);
   const [aiFeedback, setAiFeedback] = useState<string | null>(null);
   const videoRef = useRef<HTMLVideoElement>(null);
+  const prefetchClientId = useRef(Math.random().toString(36).slice(2));
 
   const getVisualization = useMutation({
     mutationFn: async (data: { type: string; operand1: number; operand2: number; answer: number }) => {
@@ -152,6 +153,35 @@ export default function MathPage() {
     });
   }, [equation]);
 
+  // Warm the server's render cache for the problem on screen (typed or an
+  // example, plus the example after it), so the video is usually ready by the
+  // time "Visualize" is pressed. Only the default style is ever requested.
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      const index = exampleEquations.findIndex((ex) => ex.label === equation.trim());
+      const labels = index === -1
+        ? [equation]
+        : exampleEquations.slice(index, index + 2).map((ex) => ex.label);
+      const problems = labels
+        .map(parseEquation)
+        .filter((p): p is ParsedEquation => p !== null)
+        .map(p => ({ type: p.type, operand1: p.operand1, operand2: p.operand2, answer: p.answer }));
+      if (problems.length === 0) return;
+      apiRequest("POST", "/api/math-visualization/prefetch", {
+        clientId: prefetchClientId.current,
+        problems,
+        styles: ["default"],
+      }).catch(() => {});
+    }, 500);
+    return () => clearTimeout(timer);
+  }, [equation]);
+
+  useEffect(() => {
+    return () => {
+      apiRequest("DELETE", `/api/math-visualization/prefetch/${prefetchClientId.current}`).catch(() => {});
+    };
+  }, []);
+
   const handleExampleClick = (label: string) => {
     setEquation(label);
     setParseError(null);
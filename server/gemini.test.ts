@@ -0,0 +1,175 @@
+import { test, before, after, beforeEach, mock } from "node:test";
+import assert from "node:assert/strict";
+import http from "http";
+import type { AddressInfo } from "net";
+
+// A local stand-in for the Gemini API. gemini.ts is pointed at it through
+// GEMINI_BASE_URL, so these tests exercise the real client end to end.
+const stub = {
+  calls: 0,
+  prompts: [] as string[],
+  active: new Map<string, number>(),
+  maxActive: new Map<string, number>(),
+  delayMs: 0,
+  reply: (prompt: string) => `reply to ${prompt.slice(0, 40)}`,
+};
+
+const server = http.createServer((req, res) => {
+  const match = req.url?.match(/models\/([^/:]+):generateContent/);
+  if (req.method !== "POST" || !match) {
+    res.writeHead(404).end();
+    return;
+  }
+  const model = match[1];
+  let body = "";
+  req.on("data", chunk => (body += chunk));
+  req.on("end", () => {
+    stub.calls++;
+    const active = (stub.active.get(model) || 0) + 1;
+    stub.active.set(model, active);
+    stub.maxActive.set(model, Math.max(stub.maxActive.get(model) || 0, active));
+
+    const prompt: string = JSON.parse(body).contents?.[0]?.parts?.[0]?.text || "";
+    stub.prompts.push(prompt);
+    setTimeout(() => {
+      stub.active.set(model, (stub.active.get(model) || 1) - 1);
+      res.writeHead(200, { "Content-Type": "application/json" });
+      res.end(JSON.stringify({
+        candidates: [{ content: { role: "model", parts: [{ text: stub.reply(prompt) }] }, finishReason: "STOP" }],
+      }));
+    }, stub.delayMs);
+  });
+});
+
+let gemini: typeof import("./gemini");
+
+before(async () => {
+  await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+  process.env.GEMINI_BASE_URL = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+  process.env.GEMINI_API_KEY = "test-key";
+  gemini = await import("./gemini");
+});
+
+after(() => {
+  server.close();
+});
+
+beforeEach(() => {
+  stub.calls = 0;
+  stub.prompts = [];
+  stub.active.clear();
+  stub.maxActive.clear();
+  stub.delayMs = 0;
+  stub.reply = prompt => `reply to ${prompt.slice(0, 40)}`;
+});
+
+test("a repeated prompt is served from the cache, ignoring whitespace", async () => {
+  const first = await gemini.generateMathHelp("3 + 4", "7", "7", true);
+  const second = await gemini.generateMathHelp("3 + 4", "7", "7", true);
+  const spaced = await gemini.generateMathHelp("3  +    4", "7", "7", true);
+
+  assert.equal(stub.calls, 1);
+  assert.equal(second, first);
+  assert.equal(spaced, first);
+});
+
+test("a cached response expires after RESPONSE_CACHE_TTL_MS", async () => {
+  const start = Date.now();
+  let now = start;
+  mock.method(Date, "now", () => now);
+  try {
+    await gemini.generateMathHelp("5 + 6", "11", "11", true);
+    now = start + gemini.RESPONSE_CACHE_TTL_MS - 1;
+    await gemini.generateMathHelp("5 + 6", "11", "11", true);
+    assert.equal(stub.calls, 1);
+
+    now = start + gemini.RESPONSE_CACHE_TTL_MS + 1;
+    await gemini.generateMathHelp("5 + 6", "11", "11", true);
+    assert.equal(stub.calls, 2);
+  } finally {
+    mock.restoreAll();
+  }
+});
+
+test("the least recently used entry is evicted past RESPONSE_CACHE_MAX_ENTRIES", async () => {
+  await gemini.generateMathHelp("evict 0", "0", "0", true);
+  for (let i = 1; i <= gemini.RESPONSE_CACHE_MAX_ENTRIES; i++) {
+    await gemini.generateMathHelp(`evict ${i}`, "0", "0", true);
+  }
+  assert.equal(stub.calls, gemini.RESPONSE_CACHE_MAX_ENTRIES + 1);
+
+  await gemini.generateMathHelp(`evict ${gemini.RESPONSE_CACHE_MAX_ENTRIES}`, "0", "0", true);
+  assert.equal(stub.calls, gemini.RESPONSE_CACHE_MAX_ENTRIES + 1);
+
+  await gemini.generateMathHelp("evict 0", "0", "0", true);
+  assert.equal(stub.calls, gemini.RESPONSE_CACHE_MAX_ENTRIES + 2);
+});
+
+test("concurrent identical prompts share one generateContent call", async () => {
+  stub.delayMs = 50;
+  const results = await Promise.all(
+    Array.from({ length: 10 }, () => gemini.generateMathHelp("8 + 9", "17", "17", true))
+  );
+
+  assert.equal(stub.calls, 1);
+  assert.equal(new Set(results).size, 1);
+});
+
+test("at most MAX_CONCURRENT_PER_MODEL calls are in flight per model", async () => {
+  stub.delayMs = 50;
+  await Promise.all(
+    Array.from({ length: 12 }, (_, i) => gemini.generateMathHelp(`limit ${i}`, "0", "0", true))
+  );
+
+  assert.equal(stub.calls, 12);
+  assert.equal(stub.maxActive.get("gemini-2.5-flash"), gemini.MAX_CONCURRENT_PER_MODEL);
+});
+
+test("a quiz response without a parseable JSON array is not cached", async () => {
+  stub.reply = () => "Sorry, I could not write questions for this story.";
+  const first = await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  assert.equal(stub.calls, 2);
+  assert.ok(first.length > 0);
+
+  stub.reply = () => '[{"question": "Who lost';
+  await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  assert.equal(stub.calls, 4);
+
+  stub.reply = () => '[{"question": "Who lost a kite?", "options": [] } ]]';
+  await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  assert.equal(stub.calls, 6);
+
+  stub.reply = () => JSON.stringify([{ question: "Who lost a kite?", options: ["Mia", "Sam", "Leo", "Ava"], correctAnswer: 0 }]);
+  const quiz = await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  await gemini.generateQuiz("The Lost Kite", "Mia's kite flew away.");
+  assert.equal(stub.calls, 7);
+  assert.equal(quiz[0].question, "Who lost a kite?");
+});
+
+test("a word definition prompt does not depend on the child's conversation", async () => {
+  const story = { storyTitle: "Friends", storyContent: "Tom was brave." };
+  await gemini.generateChatResponse("What does 'brave' mean?", story, [
+    { role: "user", content: "My name is Sam and I live on Elm Street" },
+  ]);
+  await gemini.generateChatResponse("what does 'Brave' mean when Tom jumps?", { ...story, currentPosition: 2 }, [
+    { role: "user", content: "I am scared of dogs" },
+  ]);
+
+  assert.equal(stub.calls, 1);
+  assert.ok(!stub.prompts[0].includes("Elm Street"));
+  assert.ok(!stub.prompts[0].includes("Tom jumps"));
+
+  await gemini.generateChatResponse("What does 'brave' mean?", { storyTitle: "Friends", storyContent: "Ana was brave too." }, []);
+  assert.equal(stub.calls, 2);
+});
+
+test("chat replies are never cached", async () => {
+  const story = { storyTitle: "Friends", storyContent: "Tom was brave." };
+  await gemini.generateChatResponse("Who is Tom?", story, []);
+  await gemini.generateChatResponse("Who is Tom?", story, []);
+
+  assert.equal(stub.calls, 2);
+});
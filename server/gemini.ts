@@ -1,10 +1,47 @@
 import { GoogleGenAI } from "@google/genai";
+import { createHash } from "crypto";
 
-const ai = new GoogleGenAI({ apiKey: process.env.GEMINI_API_KEY || "" });
+// GEMINI_BASE_URL points the client at a local stub model for testing.
+const ai = new GoogleGenAI({
+  apiKey: process.env.GEMINI_API_KEY || "",
+  httpOptions: process.env.GEMINI_BASE_URL ? { baseUrl: process.env.GEMINI_BASE_URL } : undefined,
+});
 
 const GEMINI_MODEL = "gemini-2.5-flash";
 const FALLBACK_MODELS = ["gemini-2.0-flash", "gemini-2.0-flash-lite"];
 
+export const RESPONSE_CACHE_TTL_MS = 30 * 60 * 1000;
+export const RESPONSE_CACHE_MAX_ENTRIES = 500;
+export const MAX_CONCURRENT_PER_MODEL = 4;
+
+// Per-model concurrency limit: at most MAX_CONCURRENT_PER_MODEL requests are
+// sent to a model at once, the rest wait in FIFO order for a free slot.
+const activeRequests = new Map<string, number>();
+const waitingRequests = new Map<string, Array<() => void>>();
+
+async function acquireModelSlot(model: string): Promise<void> {
+  const active = activeRequests.get(model) || 0;
+  if (active < MAX_CONCURRENT_PER_MODEL) {
+    activeRequests.set(model, active + 1);
+    return;
+  }
+  await new Promise<void>(resolve => {
+    const queue = waitingRequests.get(model) || [];
+    queue.push(resolve);
+    waitingRequests.set(model, queue);
+  });
+}
+
+function releaseModelSlot(model: string): void {
+  const next = waitingRequests.get(model)?.shift();
+  if (next) {
+    // Hand the slot straight to the next waiter; the active count is unchanged.
+    next();
+  } else {
+    activeRequests.set(model, (activeRequests.get(model) || 1) - 1);
+  }
+}
+
 async function callGeminiWithRetry(
   params: { model: string; contents: string; config?: any },
   maxRetries: number = 2
@@ -15,7 +52,13 @@ async function callGeminiWithRetry(
   for (const model of modelsToTry) {
     for (let attempt = 0; attempt <= maxRetries; attempt++) {
       try {
-        const response = await ai.models.generateContent({ ...params, model });
+        await acquireModelSlot(model);
+        let response;
+        try {
+          response = await ai.models.generateContent({ ...params, model });
+        } finally {
+          releaseModelSlot(model);
+        }
         if (model !== params.model) {
           console.log(`Gemini: used fallback model ${model} (primary ${params.model} was unavailable)`);
         }
@@ -44,6 +87,64 @@ async function callGeminiWithRetry(
 
   throw lastError || new Error("All Gemini models failed");
 }
+
+// Response cache keyed by the normalized prompt, with TTL and LRU eviction.
+// Identical prompts already in flight share one request instead of each
+// walking the fallback chain.
+const responseCache = new Map<string, { text: string; expiresAt: number }>();
+const pendingResponses = new Map<string, Promise<string>>();
+
+function promptCacheKey(params: { model: string; contents: string; config?: any }): string {
+  const normalize = (text: string) => text.replace(/\s+/g, " ").trim();
+  return createHash("sha256")
+    .update(JSON.stringify([
+      params.model,
+      normalize(params.contents),
+      normalize(params.config?.systemInstruction || ""),
+      params.config?.temperature,
+      params.config?.maxOutputTokens,
+    ]))
+    .digest("hex");
+}
+
+async function generateCachedText(
+  params: { model: string; contents: string; config?: any },
+  options: { isCacheable?: (text: string) => boolean } = {}
+): Promise<string> {
+  const key = promptCacheKey(params);
+
+  const cached = responseCache.get(key);
+  if (cached && cached.expiresAt > Date.now()) {
+    responseCache.delete(key);
+    responseCache.set(key, cached);
+    return cached.text;
+  }
+  responseCache.delete(key);
+
+  const pending = pendingResponses.get(key);
+  if (pending) {
+    return pending;
+  }
+
+  const request = callGeminiWithRetry(params)
+    .then(response => {
+      const text: string = response.text || "";
+      if (text && (!options.isCacheable || options.isCacheable(text))) {
+        responseCache.set(key, { text, expiresAt: Date.now() + RESPONSE_CACHE_TTL_MS });
+        if (responseCache.size > RESPONSE_CACHE_MAX_ENTRIES) {
+          responseCache.delete(responseCache.keys().next().value!);
+        }
+      }
+      return text;
+    })
+    .finally(() => {
+      pendingResponses.delete(key);
+    });
+
+  pendingResponses.set(key, request);
+  return request;
+}
+
 //updated prompts
 // Enhanced agentic system prompt for Gemini
 const AGENTIC_READING_BUDDY_PROMPT = `You are an intelligent, proactive AI Reading Buddy designed to help children learn and enjoy reading. You operate in an "agentic" mode - meaning you should be:
@@ -91,6 +192,10 @@ export async function generateChatResponse(
     const wordMatch = userMessage.match(/["']([^"']+)["']/);
     const targetWord = wordMatch ? wordMatch[1] : null;
 
+    if (isWordDefinition && targetWord) {
+      return await generateWordDefinition(context, targetWord);
+    }
+
     // Build context with reading position awareness
     const wordsArray = context.storyContent.split(/\s+/).filter(w => w.trim());
     const readProgress = context.currentPosition
@@ -125,31 +230,18 @@ Child: ${userMessage}
 
 `;
 
-    // Add special instructions for word definitions
-    if (isWordDefinition && targetWord) {
-      agenticPrompt += `
-SPECIAL INSTRUCTION - WORD DEFINITION:
-The child is asking about the word "${targetWord}". Provide:
-1. A simple, child-friendly definition
-2. An example using the word in a sentence
-3. How this word is used in the story context
-4. A fun fact or related word if appropriate
-
-Be enthusiastic about their curiosity!
-`;
-    } else {
-      agenticPrompt += `
+    agenticPrompt += `
 AGENTIC RESPONSE GUIDELINES:
 1. Answer their question thoroughly but concisely
 2. Connect your answer to the story when possible
 3. End with an engaging follow-up question or fun observation
 4. If they seem stuck, offer helpful hints or encouragement
 `;
-    }
 
     agenticPrompt += `
 Respond as an enthusiastic, intelligent AI Reading Buddy:`;
 
+    // Chat replies depend on this child's history and are never cached.
     const response = await callGeminiWithRetry({
       model: GEMINI_MODEL,
       contents: agenticPrompt,
@@ -161,7 +253,6 @@ Respond as an enthusiastic, intelligent AI Reading Buddy:`;
     });
 
     const text = response.text;
-
     if (!text) {
       return "Hmm, that's a great question! Can you tell me more about what part of the story made you curious?";
     }
@@ -173,6 +264,40 @@ Respond as an enthusiastic, intelligent AI Reading Buddy:`;
   }
 }
 
+// Word definitions are built from the story and the word alone, never from a
+// child's conversation, so the cached answer can be shared between children.
+async function generateWordDefinition(context: ChatContext, word: string): Promise<string> {
+  const prompt = `
+STORY CONTEXT:
+Title: "${context.storyTitle}"
+
+Full Story:
+${context.storyContent}
+
+WORD DEFINITION:
+A child reading this story is asking about the word "${word.trim().toLowerCase()}". Provide:
+1. A simple, child-friendly definition
+2. An example using the word in a sentence
+3. How this word is used in the story context
+4. A fun fact or related word if appropriate
+
+Be enthusiastic about their curiosity!
+
+Respond as an enthusiastic, intelligent AI Reading Buddy:`;
+
+  const text = await generateCachedText({
+    model: GEMINI_MODEL,
+    contents: prompt,
+    config: {
+      systemInstruction: AGENTIC_READING_BUDDY_PROMPT,
+      temperature: 0.7,
+      maxOutputTokens: 300,
+    },
+  });
+
+  return text || "Hmm, that's a great question! Can you tell me more about what part of the story made you curious?";
+}
+
 // New agentic function for proactive reading suggestions
 export async function generateReadingSuggestion(
   context: ChatContext,
@@ -192,7 +317,7 @@ Generate a brief (1 sentence) proactive suggestion or observation that:
 
 Keep it under 15 words and very child-friendly.`;
 
-    const response = await callGeminiWithRetry({
+    return await generateCachedText({
       model: GEMINI_MODEL,
       contents: prompt,
       config: {
@@ -200,8 +325,6 @@ Keep it under 15 words and very child-friendly.`;
         maxOutputTokens: 50,
       },
     });
-
-    return response.text || "";
   } catch (error) {
     console.error("Gemini suggestion error:", error);
     return "";
@@ -240,34 +363,38 @@ Return ONLY a valid JSON array in this exact format (no other text):
 
 Where correctAnswer is the index (0-3) of the correct option.`;
 
-    const response = await callGeminiWithRetry({
+    const text = await generateCachedText({
       model: GEMINI_MODEL,
       contents: prompt,
       config: {
         temperature: 0.5,
         maxOutputTokens: 800,
       },
+    }, {
+      isCacheable: output => parseQuizQuestions(output) !== null,
     });
 
-    const text = response.text || "";
-
-    // Parse JSON from response
-    const jsonMatch = text.match(/\[[\s\S]*\]/);
-    if (jsonMatch) {
-      const questions = JSON.parse(jsonMatch[0]);
-      if (Array.isArray(questions) && questions.length > 0) {
-        return questions.slice(0, numQuestions);
-      }
-    }
-
     // Fallback questions if parsing fails
-    return getDefaultQuestions(storyTitle);
+    return parseQuizQuestions(text)?.slice(0, numQuestions) || getDefaultQuestions(storyTitle);
   } catch (error) {
     console.error("Gemini quiz generation error:", error);
     return getDefaultQuestions(storyTitle);
   }
 }
 
+// The JSON array of questions in a quiz response, or null if there is none
+// or it does not parse (e.g. cut off at maxOutputTokens).
+function parseQuizQuestions(text: string): Array<{ question: string; options: string[]; correctAnswer: number }> | null {
+  const jsonMatch = text.match(/\[[\s\S]*\]/);
+  if (!jsonMatch) return null;
+  try {
+    const questions = JSON.parse(jsonMatch[0]);
+    return Array.isArray(questions) && questions.length > 0 ? questions : null;
+  } catch {
+    return null;
+  }
+}
+
 function getDefaultQuestions(storyTitle: string): Array<{ question: string; options: string[]; correctAnswer: number }> {
   return [
     {
@@ -354,7 +481,7 @@ export async function generateMathHelp(
          - Encourages them to try again
          Be supportive and never make them feel bad!`;
 
-    const response = await callGeminiWithRetry({
+    const text = await generateCachedText({
       model: GEMINI_MODEL,
       contents: prompt,
       config: {
@@ -364,7 +491,7 @@ export async function generateMathHelp(
       },
     });
 
-    return response.text || (isCorrect ? "Great job!" : "Good try! Let's figure this out together.");
+    return text || (isCorrect ? "Great job!" : "Good try! Let's figure this out together.");
   } catch (error) {
     console.error("Gemini math help error:", error);
     return isCorrect ? "Excellent work!" : "That's okay! Let's try another one.";
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Per-frame timing of the static-layer caching in render.py.
+Renders the same scenes with manim's default moving/static split and with
+StaticLayerScene's, without writing a movie, and prints seconds per frame.
+Usage: python3 server/manim/bench_static_layer.py [runs]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import render
+from render import Scene, tempconfig
+
+CASES = [
+    ("addition 7 + 5", render.AdditionScene, (7, 5, 12)),
+    ("addition 345 + 678", render.AdditionScene, (345, 678, 1023)),
+    ("numberline 18 - 6", render.NumberLineScene, (18, 6, 12, "subtraction")),
+]
+
+
+def with_default_layer(scene_cls):
+    class DefaultLayerScene(scene_cls):
+        def get_moving_mobjects(self, *animations):
+            return Scene.get_moving_mobjects(self, *animations)
+
+    return DefaultLayerScene
+
+
+def time_render(scene_cls, args, media_dir):
+    with tempconfig({
+        "pixel_height": 720,
+        "pixel_width": 1280,
+        "frame_rate": 30,
+        "media_dir": media_dir,
+        "write_to_movie": False,
+        "disable_caching": True,
+        "preview": False,
+        "verbosity": "ERROR",
+    }):
+        scene = scene_cls(*args)
+        start = time.perf_counter()
+        scene.render()
+        elapsed = time.perf_counter() - start
+        frames = round(scene.renderer.time * 30)
+    return elapsed, max(frames, 1)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with tempfile.TemporaryDirectory() as media_dir:
+        for label, scene_cls, args in CASES:
+            results = {}
+            for name, cls in (("default", with_default_layer(scene_cls)), ("static layer", scene_cls)):
+                best = None
+                for _ in range(runs):
+                    elapsed, frames = time_render(cls, args, media_dir)
+                    per_frame = elapsed / frames
+                    best = per_frame if best is None else min(best, per_frame)
+                results[name] = best
+            speedup = results["default"] / results["static layer"]
+            print(
+                f"{label}: default {results['default'] * 1000:.1f} ms/frame, "
+                f"static layer {results['static layer'] * 1000:.1f} ms/frame ({speedup:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
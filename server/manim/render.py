@@ -8,6 +8,8 @@ import sys
 import json
 import hashlib
 import os
+import shutil
+import signal
 
 os.environ["MANIM_RENDERER"] = "cairo"
 
@@ -31,8 +33,197 @@ ACCENT_2 = CHILD_COLORS["green"]
 ACCENT_3 = CHILD_COLORS["orange"]
 ACCENT_4 = CHILD_COLORS["purple"]
 
+# Largest operands still drawn as one dot (or one unit jump) per item. Beyond
+# these the scenes switch to place-value pictures whose mobject count stays
+# bounded however large the operands get.
+ADDITION_DOT_LIMIT = 12
+SUBTRACTION_DOT_LIMIT = 15
+GROUP_DOT_LIMIT = 6
+DIVISION_DOT_LIMIT = 20
+DIVISION_BAR_LIMIT = 8
+NUMBER_LINE_UNIT_LIMIT = 25
+NUMBER_LINE_STEP_LIMIT = 10
+NUMBER_LINE_MAX_TICKS = 10
+
+BLOCK_UNIT = 0.1
+
+# Bump when scene output changes so stale cached videos are not served.
+RENDER_VERSION = 2
+
+
+class StaticLayerScene(Scene):
+    """
+    Scene whose Cairo static layer holds every top-level mobject the current
+    animation leaves alone. Manim's default treats everything added after the
+    first moving mobject as moving, so the title and equation were
+    re-rasterized on every frame while only the dots changed. Static waits are
+    already written by the renderer as one rasterized frame repeated.
+    """
+
+    def get_moving_mobjects(self, *animations):
+        animated = set()
+        for anim in animations:
+            if anim.mobject is not None:
+                animated.update(id(m) for m in anim.mobject.get_family())
+        leaves = list(_leaf_animations(animations))
+
+        moving = []
+        regions = []
+        for mob in self.mobjects:
+            family_ids = {id(m) for m in mob.get_family()}
+            bounds = _bounds(mob)
+            is_moving = (
+                not family_ids.isdisjoint(animated)
+                or len(mob.get_family_updaters()) > 0
+                or mob in self.foreground_mobjects
+                # Keep z-order: a still mobject drawn above a moving one must
+                # stay above it wherever that one travels, so anything that
+                # overlaps a moving mobject's path is redrawn each frame too.
+                or any(_boxes_overlap(bounds, region) for region in regions)
+            )
+            if is_moving:
+                moving.append(mob)
+                regions.append(_motion_bounds(mob, bounds, family_ids, leaves))
+        return moving
+
+
+def _leaf_animations(animations):
+    for anim in animations:
+        sub_animations = getattr(anim, "animations", None)
+        if sub_animations:
+            yield from _leaf_animations(sub_animations)
+        else:
+            yield anim
+
+
+def _bounds(mob):
+    if len(mob.get_all_points()) == 0:
+        return None
+    return mob.get_corner(DL), mob.get_corner(UR)
+
+
+def _union_bounds(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return np.minimum(a[0], b[0]), np.maximum(a[1], b[1])
+
+
+def _motion_bounds(mob, bounds, family_ids, leaves):
+    """
+    Box covering a moving mobject from its current state to the end state of
+    every Transform acting on it (moves, fades with shift, replacements).
+    Straight-line paths stay inside the box around both ends.
+    """
+    region = bounds
+    for anim in leaves:
+        target = getattr(anim, "target_copy", None)
+        if target is not None and anim.mobject is not None and id(anim.mobject) in family_ids:
+            region = _union_bounds(region, _bounds(target))
+    return region
+
+
+def _boxes_overlap(a, b):
+    if a is None or b is None:
+        return False
+    (a_min, a_max), (b_min, b_max) = a, b
+    return (
+        a_min[0] <= b_max[0] and b_min[0] <= a_max[0]
+        and a_min[1] <= b_max[1] and b_min[1] <= a_max[1]
+    )
+
+
+def expanded_form(n):
+    """Split n into its non-zero place-value parts, largest first: 305 -> [300, 5]."""
+    parts = []
+    place = 1
+    while n > 0:
+        digit = n % 10
+        if digit:
+            parts.append(digit * place)
+        n //= 10
+        place *= 10
+    return parts[::-1] or [0]
+
+
+def digit_sum(n):
+    return sum(int(d) for d in str(abs(n)))
+
+
+def make_block(place, color):
+    size = BLOCK_UNIT
+    style = dict(color=color, fill_opacity=0.85, stroke_width=1.5, stroke_color=BG_COLOR)
+    if place == 1:
+        return Square(side_length=size, **style)
+    if place == 10:
+        return Rectangle(width=size, height=10 * size, **style)
+    flat = Square(side_length=10 * size, **style)
+    if place == 100:
+        return flat
+    back = flat.copy().shift((UP + RIGHT) * 2 * size).set_fill(opacity=0.45)
+    return VGroup(back, flat)
+
+
+def place_value_blocks(n, color):
+    """
+    Base-ten blocks for n: thousand cubes, hundred flats, ten rods and ones.
+    At most ten blocks per place for n below 10000; the server derives every
+    answer from operands of at most 1000, so the largest sum needs two cubes.
+    """
+    n = max(n, 0)
+    counts = [(1000, n // 1000), (100, n // 100 % 10), (10, n // 10 % 10), (1, n % 10)]
+
+    columns = VGroup()
+    for place, count in counts:
+        if count == 0:
+            continue
+        column = VGroup(*[make_block(place, color) for _ in range(count)])
+        if place >= 100:
+            for i, block in enumerate(column):
+                block.shift((RIGHT + DOWN) * i * 1.5 * BLOCK_UNIT)
+        elif place == 10:
+            column.arrange(RIGHT, buff=0.05)
+        else:
+            column.arrange(UP, buff=0.0125)
+        columns.add(column)
+    if len(columns) > 0:
+        columns.arrange(RIGHT, buff=0.3, aligned_edge=DOWN)
+    return columns
+
+
+def blocks_of(columns):
+    return [block for column in columns for block in column]
+
+
+def fit_to_stage(mob, max_width=10, max_height=3.2):
+    if mob.width > max_width:
+        mob.scale_to_fit_width(max_width)
+    if mob.height > max_height:
+        mob.scale_to_fit_height(max_height)
+    mob.move_to(ORIGIN + DOWN * 0.3)
+    return mob
+
+
+def area_lengths(parts, total):
+    """Side lengths for an area model: proportional, but never too thin to label."""
+    whole = sum(parts)
+    if whole == 0:
+        return [total / len(parts)] * len(parts)
+    weights = [max(p / whole, 0.2) for p in parts]
+    return [total * w / sum(weights) for w in weights]
+
 
-class AdditionScene(Scene):
+def nice_step(span, max_ticks=NUMBER_LINE_MAX_TICKS):
+    step = 1
+    while True:
+        for mult in (1, 2, 5):
+            if span / (step * mult) <= max_ticks:
+                return step * mult
+        step *= 10
+
+
+class AdditionScene(StaticLayerScene):
     def __init__(self, operand1, operand2, answer, **kwargs):
         super().__init__(**kwargs)
         self.op1 = operand1
@@ -56,8 +247,48 @@ class AdditionScene(Scene):
         equation.next_to(title, DOWN, buff=0.6)
         self.play(FadeIn(equation, shift=UP * 0.3), run_time=0.5)
 
-        cap1 = min(self.op1, 12)
-        cap2 = min(self.op2, 12)
+        if self.op1 > ADDITION_DOT_LIMIT or self.op2 > ADDITION_DOT_LIMIT:
+            combined = self._play_blocks()
+        else:
+            combined = self._play_dots()
+
+        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        equation_final = VGroup(
+            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("+", font_size=48, color=ACCENT_1, font="sans-serif", weight=BOLD),
+            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
+            answer_text,
+        ).arrange(RIGHT, buff=0.4)
+        equation_final.move_to(equation.get_center())
+
+        self.play(
+            Transform(equation, equation_final),
+            run_time=0.6,
+        )
+
+        answer_label = Text(str(self.ans), font_size=36, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        answer_label.next_to(combined, DOWN, buff=0.3)
+        self.play(FadeIn(answer_label, shift=UP * 0.2), run_time=0.4)
+
+        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
+        self.play(Create(box), run_time=0.4)
+
+        sparkles = VGroup()
+        for _ in range(8):
+            s = Star(n=5, outer_radius=0.1, inner_radius=0.04, color=CHILD_COLORS["yellow"], fill_opacity=1, stroke_width=0)
+            angle = np.random.uniform(0, 2 * PI)
+            dist = np.random.uniform(0.5, 1.2)
+            s.move_to(answer_text.get_center() + np.array([np.cos(angle) * dist, np.sin(angle) * dist, 0]))
+            sparkles.add(s)
+        self.play(LaggedStart(*[FadeIn(s, scale=0.3) for s in sparkles], lag_ratio=0.05), run_time=0.5)
+        self.play(LaggedStart(*[FadeOut(s, scale=2) for s in sparkles], lag_ratio=0.05), run_time=0.5)
+
+        self.wait(0.5)
+
+    def _play_dots(self):
+        cap1 = min(self.op1, ADDITION_DOT_LIMIT)
+        cap2 = min(self.op2, ADDITION_DOT_LIMIT)
 
         dots_left = VGroup()
         for i in range(cap1):
@@ -126,42 +357,55 @@ class AdditionScene(Scene):
             run_time=0.8,
         )
 
-        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        equation_final = VGroup(
-            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("+", font_size=48, color=ACCENT_1, font="sans-serif", weight=BOLD),
-            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
-            answer_text,
-        ).arrange(RIGHT, buff=0.4)
-        equation_final.move_to(equation.get_center())
+        return combined
 
-        self.play(
-            Transform(equation, equation_final),
-            run_time=0.6,
-        )
+    def _play_blocks(self):
+        blocks_left = place_value_blocks(self.op1, ACCENT_1)
+        blocks_right = place_value_blocks(self.op2, ACCENT_2)
+        both = fit_to_stage(VGroup(blocks_left, blocks_right).arrange(RIGHT, buff=1.2, aligned_edge=DOWN))
 
-        answer_label = Text(str(self.ans), font_size=36, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        answer_label.next_to(combined, DOWN, buff=0.3)
-        self.play(FadeIn(answer_label, shift=UP * 0.2), run_time=0.4)
+        label_left = Text(str(self.op1), font_size=32, color=ACCENT_1, font="sans-serif", weight=BOLD)
+        label_left.next_to(blocks_left, DOWN, buff=0.3)
+        label_right = Text(str(self.op2), font_size=32, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        label_right.next_to(blocks_right, DOWN, buff=0.3)
 
-        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
-        self.play(Create(box), run_time=0.4)
+        self.play(
+            LaggedStart(*[FadeIn(b, scale=0.8) for b in blocks_of(blocks_left)], lag_ratio=0.08),
+            FadeIn(label_left, shift=UP * 0.2),
+            run_time=0.8,
+        )
+        self.play(
+            LaggedStart(*[FadeIn(b, scale=0.8) for b in blocks_of(blocks_right)], lag_ratio=0.08),
+            FadeIn(label_right, shift=UP * 0.2),
+            run_time=0.8,
+        )
+        self.wait(0.3)
 
-        sparkles = VGroup()
-        for _ in range(8):
-            s = Star(n=5, outer_radius=0.1, inner_radius=0.04, color=CHILD_COLORS["yellow"], fill_opacity=1, stroke_width=0)
-            angle = np.random.uniform(0, 2 * PI)
-            dist = np.random.uniform(0.5, 1.2)
-            s.move_to(answer_text.get_center() + np.array([np.cos(angle) * dist, np.sin(angle) * dist, 0]))
-            sparkles.add(s)
-        self.play(LaggedStart(*[FadeIn(s, scale=0.3) for s in sparkles], lag_ratio=0.05), run_time=0.5)
-        self.play(LaggedStart(*[FadeOut(s, scale=2) for s in sparkles], lag_ratio=0.05), run_time=0.5)
+        total = fit_to_stage(place_value_blocks(self.ans, ACCENT_2))
+        if digit_sum(self.op1) + digit_sum(self.op2) != digit_sum(self.ans):
+            trade_label = Text("10 of a kind make 1 bigger block!", font_size=28, color=ACCENT_3, font="sans-serif")
+            trade_label.next_to(both, UP, buff=0.3)
+            self.play(FadeIn(trade_label, shift=DOWN * 0.2), run_time=0.4)
+            self.wait(0.3)
+            self.play(
+                ReplacementTransform(both, total),
+                FadeOut(trade_label),
+                FadeOut(label_left),
+                FadeOut(label_right),
+                run_time=1.0,
+            )
+        else:
+            self.play(
+                ReplacementTransform(both, total),
+                FadeOut(label_left),
+                FadeOut(label_right),
+                run_time=0.8,
+            )
 
-        self.wait(0.5)
+        return total
 
 
-class SubtractionScene(Scene):
+class SubtractionScene(StaticLayerScene):
     def __init__(self, operand1, operand2, answer, **kwargs):
         super().__init__(**kwargs)
         self.op1 = operand1
@@ -185,7 +429,33 @@ class SubtractionScene(Scene):
         equation.next_to(title, DOWN, buff=0.6)
         self.play(FadeIn(equation, shift=UP * 0.3), run_time=0.5)
 
-        cap_total = min(self.op1, 15)
+        if self.op1 > SUBTRACTION_DOT_LIMIT:
+            remaining = self._play_blocks()
+        else:
+            remaining = self._play_dots()
+
+        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        equation_final = VGroup(
+            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("-", font_size=48, color=ACCENT_3, font="sans-serif", weight=BOLD),
+            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
+            answer_text,
+        ).arrange(RIGHT, buff=0.4)
+        equation_final.move_to(equation.get_center())
+
+        self.play(Transform(equation, equation_final), run_time=0.6)
+
+        result_label = Text(str(self.ans), font_size=36, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        result_label.next_to(remaining, DOWN, buff=0.3)
+        self.play(FadeIn(result_label, shift=UP * 0.2), run_time=0.4)
+
+        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
+        self.play(Create(box), run_time=0.4)
+        self.wait(0.5)
+
+    def _play_dots(self):
+        cap_total = min(self.op1, SUBTRACTION_DOT_LIMIT)
         cap_remove = min(self.op2, cap_total)
 
         dots = VGroup()
@@ -249,28 +519,50 @@ class SubtractionScene(Scene):
         if anims:
             self.play(*anims, run_time=0.6)
 
-        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        equation_final = VGroup(
-            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("-", font_size=48, color=ACCENT_3, font="sans-serif", weight=BOLD),
-            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
-            answer_text,
-        ).arrange(RIGHT, buff=0.4)
-        equation_final.move_to(equation.get_center())
+        return remaining
 
-        self.play(Transform(equation, equation_final), run_time=0.6)
+    def _play_blocks(self):
+        blocks = fit_to_stage(place_value_blocks(self.op1, ACCENT_1))
 
-        result_label = Text(str(self.ans), font_size=36, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        result_label.next_to(remaining, DOWN, buff=0.3)
-        self.play(FadeIn(result_label, shift=UP * 0.2), run_time=0.4)
+        count_label = Text(str(self.op1), font_size=32, color=ACCENT_1, font="sans-serif", weight=BOLD)
+        count_label.next_to(blocks, DOWN, buff=0.3)
 
-        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
-        self.play(Create(box), run_time=0.4)
-        self.wait(0.5)
+        self.play(
+            LaggedStart(*[FadeIn(b, scale=0.8) for b in blocks_of(blocks)], lag_ratio=0.06),
+            FadeIn(count_label),
+            run_time=0.8,
+        )
+        self.wait(0.3)
+
+        remove_label = Text(f"Take away {self.op2}", font_size=28, color=ACCENT_3, font="sans-serif")
+        remove_label.next_to(blocks, UP, buff=0.3)
+        self.play(FadeIn(remove_label, shift=DOWN * 0.2), run_time=0.4)
 
+        remaining = place_value_blocks(max(self.ans, 0), ACCENT_2)
+        taken = place_value_blocks(min(self.op2, self.op1), ACCENT_3)
+        split = fit_to_stage(VGroup(remaining, taken).arrange(RIGHT, buff=1.2, aligned_edge=DOWN))
 
-class MultiplicationScene(Scene):
+        self.play(
+            ReplacementTransform(blocks, split),
+            FadeOut(count_label),
+            run_time=0.8,
+        )
+
+        cross = Cross(taken, stroke_color=CHILD_COLORS["red"], stroke_width=4)
+        self.play(Create(cross), run_time=0.4)
+        self.wait(0.3)
+
+        self.play(
+            FadeOut(VGroup(taken, cross), shift=UP * 0.5 + RIGHT * 0.3, scale=0.3),
+            FadeOut(remove_label),
+            run_time=0.8,
+        )
+        self.play(remaining.animate.move_to(ORIGIN + DOWN * 0.3), run_time=0.6)
+
+        return remaining
+
+
+class MultiplicationScene(StaticLayerScene):
     def __init__(self, operand1, operand2, answer, **kwargs):
         super().__init__(**kwargs)
         self.op1 = operand1
@@ -294,6 +586,38 @@ class MultiplicationScene(Scene):
         equation.next_to(title, DOWN, buff=0.6)
         self.play(FadeIn(equation, shift=UP * 0.3), run_time=0.5)
 
+        if self.op1 > GROUP_DOT_LIMIT or self.op2 > GROUP_DOT_LIMIT:
+            groups = self._play_blocks(equation)
+        else:
+            groups = self._play_dots(equation)
+
+        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        equation_final = VGroup(
+            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("\u00d7", font_size=48, color=ACCENT_4, font="sans-serif", weight=BOLD),
+            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
+            answer_text,
+        ).arrange(RIGHT, buff=0.4)
+        equation_final.move_to(equation.get_center())
+
+        self.play(Transform(equation, equation_final), run_time=0.6)
+
+        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
+        self.play(Create(box), run_time=0.4)
+
+        sparkles = VGroup()
+        for _ in range(6):
+            s = Star(n=5, outer_radius=0.1, inner_radius=0.04, color=CHILD_COLORS["yellow"], fill_opacity=1, stroke_width=0)
+            angle = np.random.uniform(0, 2 * PI)
+            dist = np.random.uniform(0.5, 1.0)
+            s.move_to(answer_text.get_center() + np.array([np.cos(angle) * dist, np.sin(angle) * dist, 0]))
+            sparkles.add(s)
+        self.play(LaggedStart(*[FadeIn(s, scale=0.3) for s in sparkles], lag_ratio=0.05), run_time=0.4)
+        self.play(LaggedStart(*[FadeOut(s, scale=2) for s in sparkles], lag_ratio=0.05), run_time=0.4)
+        self.wait(0.3)
+
+    def _play_dots(self, equation):
         group_desc = Text(
             f"{self.op2} groups of {self.op1}",
             font_size=28, color=ACCENT_4, font="sans-serif"
@@ -305,8 +629,8 @@ class MultiplicationScene(Scene):
                   CHILD_COLORS["pink"], CHILD_COLORS["teal"],
                   CHILD_COLORS["yellow"], CHILD_COLORS["red"]]
 
-        cap_groups = min(self.op2, 6)
-        cap_per = min(self.op1, 6)
+        cap_groups = min(self.op2, GROUP_DOT_LIMIT)
+        cap_per = min(self.op1, GROUP_DOT_LIMIT)
 
         groups = VGroup()
         for g in range(cap_groups):
@@ -348,34 +672,76 @@ class MultiplicationScene(Scene):
         self.wait(0.3)
         self.play(FadeOut(group_desc), run_time=0.3)
 
-        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        equation_final = VGroup(
-            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("\u00d7", font_size=48, color=ACCENT_4, font="sans-serif", weight=BOLD),
-            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
-            answer_text,
-        ).arrange(RIGHT, buff=0.4)
-        equation_final.move_to(equation.get_center())
+        return groups
 
-        self.play(Transform(equation, equation_final), run_time=0.6)
+    def _play_blocks(self, equation):
+        group_desc = Text(
+            "Split each number by place value",
+            font_size=28, color=ACCENT_4, font="sans-serif"
+        )
+        group_desc.next_to(equation, DOWN, buff=0.4)
+        self.play(FadeIn(group_desc, shift=UP * 0.2), run_time=0.4)
 
-        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
-        self.play(Create(box), run_time=0.4)
+        colors = [ACCENT_1, ACCENT_2, ACCENT_3, ACCENT_4,
+                  CHILD_COLORS["pink"], CHILD_COLORS["teal"],
+                  CHILD_COLORS["yellow"], CHILD_COLORS["red"]]
+
+        col_parts = expanded_form(self.op1)
+        row_parts = expanded_form(self.op2)
+        widths = area_lengths(col_parts, 7.0)
+        heights = area_lengths(row_parts, 2.2)
+
+        cells = VGroup()
+        col_labels = VGroup()
+        row_labels = VGroup()
+        top = 0
+        for r, (row_part, h) in enumerate(zip(row_parts, heights)):
+            left = 0
+            for c, (col_part, w) in enumerate(zip(col_parts, widths)):
+                col = colors[(r * len(col_parts) + c) % len(colors)]
+                rect = Rectangle(width=w, height=h, color=col, fill_opacity=0.35, stroke_width=2)
+                rect.move_to(RIGHT * (left + w / 2) + DOWN * (top + h / 2))
+                product = Text(str(row_part * col_part), font_size=22, color=TEXT_COLOR, font="sans-serif", weight=BOLD)
+                if product.width > w * 0.9:
+                    product.scale_to_fit_width(w * 0.9)
+                product.move_to(rect)
+                cells.add(VGroup(rect, product))
+                if r == 0:
+                    label = Text(str(col_part), font_size=22, color=TEXT_COLOR, font="sans-serif", weight=BOLD)
+                    label.next_to(rect, UP, buff=0.1)
+                    col_labels.add(label)
+                left += w
+            label = Text(str(row_part), font_size=22, color=TEXT_COLOR, font="sans-serif", weight=BOLD)
+            label.next_to(cells[-len(col_parts)], LEFT, buff=0.1)
+            row_labels.add(label)
+            top += h
+
+        area = VGroup(cells, col_labels, row_labels)
+        area.move_to(ORIGIN + DOWN * 0.8)
+
+        self.play(FadeIn(col_labels), FadeIn(row_labels), run_time=0.4)
+        self.play(
+            LaggedStart(*[FadeIn(cell, scale=0.9) for cell in cells], lag_ratio=0.15),
+            run_time=1.0,
+        )
+
+        partials = [r * c for r in row_parts for c in col_parts]
+        sum_text = Text(
+            " + ".join(str(p) for p in partials) + f" = {sum(partials)}",
+            font_size=28, color=ACCENT_2, font="sans-serif", weight=BOLD
+        )
+        if sum_text.width > 10:
+            sum_text.scale_to_fit_width(10)
+        sum_text.next_to(area, DOWN, buff=0.3)
+        self.play(FadeIn(sum_text, shift=UP * 0.2), run_time=0.5)
 
-        sparkles = VGroup()
-        for _ in range(6):
-            s = Star(n=5, outer_radius=0.1, inner_radius=0.04, color=CHILD_COLORS["yellow"], fill_opacity=1, stroke_width=0)
-            angle = np.random.uniform(0, 2 * PI)
-            dist = np.random.uniform(0.5, 1.0)
-            s.move_to(answer_text.get_center() + np.array([np.cos(angle) * dist, np.sin(angle) * dist, 0]))
-            sparkles.add(s)
-        self.play(LaggedStart(*[FadeIn(s, scale=0.3) for s in sparkles], lag_ratio=0.05), run_time=0.4)
-        self.play(LaggedStart(*[FadeOut(s, scale=2) for s in sparkles], lag_ratio=0.05), run_time=0.4)
         self.wait(0.3)
+        self.play(FadeOut(group_desc), run_time=0.3)
 
+        return VGroup(area, sum_text)
 
-class DivisionScene(Scene):
+
+class DivisionScene(StaticLayerScene):
     def __init__(self, operand1, operand2, answer, **kwargs):
         super().__init__(**kwargs)
         self.op1 = operand1
@@ -399,9 +765,38 @@ class DivisionScene(Scene):
         equation.next_to(title, DOWN, buff=0.6)
         self.play(FadeIn(equation, shift=UP * 0.3), run_time=0.5)
 
-        cap_total = min(self.op1, 20)
-        cap_groups = min(self.op2, 6)
-        cap_per = min(self.ans, 6)
+        if self.op1 > DIVISION_DOT_LIMIT or self.op2 > GROUP_DOT_LIMIT or self.ans > GROUP_DOT_LIMIT:
+            groups = self._play_blocks()
+        else:
+            groups = self._play_dots()
+
+        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        equation_final = VGroup(
+            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("\u00f7", font_size=48, color=CHILD_COLORS["teal"], font="sans-serif", weight=BOLD),
+            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
+            answer_text,
+        ).arrange(RIGHT, buff=0.4)
+        equation_final.move_to(equation.get_center())
+
+        self.play(Transform(equation, equation_final), run_time=0.6)
+
+        each_label = Text(
+            f"{self.ans} in each group!",
+            font_size=28, color=ACCENT_2, font="sans-serif", weight=BOLD
+        )
+        each_label.next_to(groups, DOWN, buff=0.3)
+        self.play(FadeIn(each_label, shift=UP * 0.2), run_time=0.4)
+
+        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
+        self.play(Create(box), run_time=0.4)
+        self.wait(0.5)
+
+    def _play_dots(self):
+        cap_total = min(self.op1, DIVISION_DOT_LIMIT)
+        cap_groups = min(self.op2, GROUP_DOT_LIMIT)
+        cap_per = min(self.ans, GROUP_DOT_LIMIT)
 
         all_dots = VGroup()
         for i in range(cap_total):
@@ -488,31 +883,104 @@ class DivisionScene(Scene):
             border_anims.append(FadeIn(grp[2]))
         self.play(*border_anims, run_time=0.5)
 
-        answer_text = Text(str(self.ans), font_size=56, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        equation_final = VGroup(
-            Text(str(self.op1), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("\u00f7", font_size=48, color=CHILD_COLORS["teal"], font="sans-serif", weight=BOLD),
-            Text(str(self.op2), font_size=56, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("=", font_size=48, color=TEXT_COLOR, font="sans-serif"),
-            answer_text,
-        ).arrange(RIGHT, buff=0.4)
-        equation_final.move_to(equation.get_center())
+        return groups
 
-        self.play(Transform(equation, equation_final), run_time=0.6)
+    def _play_blocks(self):
+        blocks = fit_to_stage(place_value_blocks(self.op1, ACCENT_1))
 
-        each_label = Text(
-            f"{self.ans} in each group!",
-            font_size=28, color=ACCENT_2, font="sans-serif", weight=BOLD
+        count_label = Text(
+            f"{self.op1} items total",
+            font_size=28, color=ACCENT_1, font="sans-serif"
         )
-        each_label.next_to(groups, DOWN, buff=0.3)
-        self.play(FadeIn(each_label, shift=UP * 0.2), run_time=0.4)
+        count_label.next_to(blocks, DOWN, buff=0.3)
 
-        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
-        self.play(Create(box), run_time=0.4)
-        self.wait(0.5)
+        self.play(
+            LaggedStart(*[FadeIn(b, scale=0.8) for b in blocks_of(blocks)], lag_ratio=0.06),
+            FadeIn(count_label),
+            run_time=0.8,
+        )
+        self.wait(0.3)
 
+        split_label = Text(
+            f"Split into {self.op2} equal groups",
+            font_size=28, color=CHILD_COLORS["teal"], font="sans-serif"
+        )
+        split_label.next_to(blocks, UP, buff=0.3)
+        self.play(
+            FadeIn(split_label, shift=DOWN * 0.2),
+            FadeOut(count_label),
+            run_time=0.4,
+        )
+        self.wait(0.3)
+
+        colors = [ACCENT_1, ACCENT_2, ACCENT_3, ACCENT_4,
+                  CHILD_COLORS["pink"], CHILD_COLORS["teal"]]
 
-class NumberLineScene(Scene):
+        # Bar model: op1 as one bar cut into op2 equal parts. Past a handful of
+        # groups only the first and last parts are drawn, with a gap between.
+        group_count = max(self.op2, 1)
+        leftover = max(self.op1 - self.ans * group_count, 0)
+        bar_width = 10.0
+        leftover_width = 0
+        if leftover > 0:
+            leftover_width = max(0.8, bar_width * leftover / max(self.op1, 1))
+        groups_width = bar_width - leftover_width
+
+        if group_count <= DIVISION_BAR_LIMIT:
+            shown = list(range(group_count))
+            part_width = groups_width / group_count
+            gap_width = 0
+        else:
+            shown = [0, 1, 2, group_count - 1]
+            part_width = groups_width / 8
+            gap_width = groups_width - 4 * part_width
+
+        bar = VGroup()
+        left = 0
+        for g in shown:
+            if g == group_count - 1 and gap_width > 0:
+                gap = Text("\u2026", font_size=36, color=TEXT_COLOR, font="sans-serif", weight=BOLD)
+                gap.move_to(RIGHT * (left + gap_width / 2))
+                bar.add(gap)
+                left += gap_width
+            col = colors[g % len(colors)]
+            part = Rectangle(width=part_width, height=0.8, color=col, fill_opacity=0.45, stroke_width=2)
+            part.move_to(RIGHT * (left + part_width / 2))
+            per_label = Text(str(self.ans), font_size=22, color=TEXT_COLOR, font="sans-serif", weight=BOLD)
+            if per_label.width > part_width * 0.9:
+                per_label.scale_to_fit_width(part_width * 0.9)
+            per_label.move_to(part)
+            bar.add(VGroup(part, per_label))
+            left += part_width
+        if leftover > 0:
+            rest = Rectangle(width=leftover_width, height=0.8, color=TEXT_COLOR, fill_opacity=0.15, stroke_width=2)
+            rest.move_to(RIGHT * (left + leftover_width / 2))
+            rest_label = Text(f"{leftover} left", font_size=18, color=TEXT_COLOR, font="sans-serif")
+            if rest_label.width > leftover_width * 0.9:
+                rest_label.scale_to_fit_width(leftover_width * 0.9)
+            rest_label.move_to(rest)
+            bar.add(VGroup(rest, rest_label))
+        bar.move_to(ORIGIN + DOWN * 0.3)
+
+        groups_span = Line(bar.get_left(), bar.get_left() + RIGHT * groups_width)
+        brace = Brace(groups_span, DOWN, color=CHILD_COLORS["teal"])
+        brace_label = Text(
+            f"{self.op2} groups of {self.ans}",
+            font_size=24, color=CHILD_COLORS["teal"], font="sans-serif", weight=BOLD
+        )
+        brace_label.next_to(brace, DOWN, buff=0.1)
+
+        self.play(
+            ReplacementTransform(blocks, bar),
+            FadeOut(split_label),
+            run_time=1.0,
+        )
+        self.play(GrowFromCenter(brace), FadeIn(brace_label), run_time=0.5)
+
+        return VGroup(bar, brace, brace_label)
+
+
+class NumberLineScene(StaticLayerScene):
     def __init__(self, operand1, operand2, answer, op_type, **kwargs):
         super().__init__(**kwargs)
         self.op1 = operand1
@@ -540,9 +1008,41 @@ class NumberLineScene(Scene):
         equation.next_to(title, DOWN, buff=0.5)
         self.play(FadeIn(equation, shift=UP * 0.3), run_time=0.5)
 
+        if max(self.op1, self.ans) + 2 > NUMBER_LINE_UNIT_LIMIT or self.op2 > NUMBER_LINE_STEP_LIMIT:
+            num_line = self._play_scaled_line()
+        else:
+            num_line = self._play_unit_line()
+
+        end_dot = Dot(num_line.n2p(self.ans), color=ACCENT_2, radius=0.15)
+        end_label = Text(str(self.ans), font_size=28, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        end_label.next_to(end_dot, UP, buff=0.3)
+
+        self.play(
+            GrowFromCenter(end_dot),
+            FadeIn(end_label, shift=DOWN * 0.2),
+            run_time=0.5,
+        )
+
+        answer_text = Text(str(self.ans), font_size=48, color=ACCENT_2, font="sans-serif", weight=BOLD)
+        equation_final = VGroup(
+            Text(str(self.op1), font_size=48, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text(op_sym, font_size=40, color=title_color, font="sans-serif", weight=BOLD),
+            Text(str(self.op2), font_size=48, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
+            Text("=", font_size=40, color=TEXT_COLOR, font="sans-serif"),
+            answer_text,
+        ).arrange(RIGHT, buff=0.4)
+        equation_final.move_to(equation.get_center())
+
+        self.play(Transform(equation, equation_final), run_time=0.6)
+
+        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
+        self.play(Create(box), run_time=0.4)
+        self.wait(0.5)
+
+    def _play_unit_line(self):
         line_min = 0
         line_max = max(self.op1, self.ans) + 2
-        line_max = min(line_max, 25)
+        line_max = min(line_max, NUMBER_LINE_UNIT_LIMIT)
 
         num_line = NumberLine(
             x_range=[line_min, line_max, 1],
@@ -564,7 +1064,7 @@ class NumberLineScene(Scene):
 
         direction = 1 if self.op_type == "addition" else -1
         jump_color = ACCENT_2 if self.op_type == "addition" else ACCENT_3
-        steps = min(self.op2, 10)
+        steps = min(self.op2, NUMBER_LINE_STEP_LIMIT)
 
         for i in range(steps):
             current = self.op1 + direction * i
@@ -588,31 +1088,67 @@ class NumberLineScene(Scene):
 
             self.play(Create(arc), FadeIn(arrow_tip), run_time=0.15)
 
-        end_dot = Dot(num_line.n2p(self.ans), color=ACCENT_2, radius=0.15)
-        end_label = Text(str(self.ans), font_size=28, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        end_label.next_to(end_dot, UP, buff=0.3)
+        return num_line
 
-        self.play(
-            GrowFromCenter(end_dot),
-            FadeIn(end_label, shift=DOWN * 0.2),
-            run_time=0.5,
+    def _play_scaled_line(self):
+        low = min(0, self.op1, self.ans)
+        high = max(self.op1, self.ans)
+        step = nice_step(max(high - low, 1))
+        line_min = (low // step) * step
+        line_max = -(-high // step) * step
+        if line_max == line_min:
+            line_max += step
+
+        num_line = NumberLine(
+            x_range=[line_min, line_max, step],
+            length=10,
+            color=TEXT_COLOR,
+            include_numbers=True,
+            label_direction=DOWN,
+            font_size=22,
+            tick_size=0.1,
+            numbers_to_include=range(line_min, line_max + 1, step),
         )
+        num_line.move_to(ORIGIN + DOWN * 0.5)
+        self.play(Create(num_line), run_time=0.6)
 
-        answer_text = Text(str(self.ans), font_size=48, color=ACCENT_2, font="sans-serif", weight=BOLD)
-        equation_final = VGroup(
-            Text(str(self.op1), font_size=48, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text(op_sym, font_size=40, color=title_color, font="sans-serif", weight=BOLD),
-            Text(str(self.op2), font_size=48, color=TEXT_COLOR, font="sans-serif", weight=BOLD),
-            Text("=", font_size=40, color=TEXT_COLOR, font="sans-serif"),
-            answer_text,
-        ).arrange(RIGHT, buff=0.4)
-        equation_final.move_to(equation.get_center())
+        start_dot = Dot(num_line.n2p(self.op1), color=ACCENT_1, radius=0.12)
+        start_label = Text(str(self.op1), font_size=24, color=ACCENT_1, font="sans-serif", weight=BOLD)
+        start_label.next_to(start_dot, UP, buff=0.2)
+        self.play(GrowFromCenter(start_dot), FadeIn(start_label), run_time=0.4)
 
-        self.play(Transform(equation, equation_final), run_time=0.6)
+        # One jump per place-value part of op2 (+200, +30, +7) instead of one
+        # per unit, so the number of arcs is at most the number of digits.
+        direction = 1 if self.op_type == "addition" else -1
+        jump_color = ACCENT_2 if self.op_type == "addition" else ACCENT_3
+        sign = "+" if direction > 0 else "-"
 
-        box = SurroundingRectangle(answer_text, color=ACCENT_2, buff=0.15, corner_radius=0.1, stroke_width=3)
-        self.play(Create(box), run_time=0.4)
-        self.wait(0.5)
+        current = self.op1
+        for part in expanded_form(self.op2):
+            if part == 0:
+                break
+            next_val = current + direction * part
+
+            arc = ArcBetweenPoints(
+                num_line.n2p(current),
+                num_line.n2p(next_val),
+                angle=-PI / 3 if direction > 0 else PI / 3,
+                color=jump_color,
+                stroke_width=2,
+            )
+            arc.shift(UP * 0.3)
+
+            arrow_tip = Triangle(fill_opacity=1, color=jump_color, stroke_width=0)
+            arrow_tip.scale(0.08)
+            arrow_tip.move_to(arc.get_end())
+
+            jump_label = Text(f"{sign}{part}", font_size=20, color=jump_color, font="sans-serif", weight=BOLD)
+            jump_label.next_to(arc, UP, buff=0.1)
+
+            self.play(Create(arc), FadeIn(arrow_tip), FadeIn(jump_label), run_time=0.4)
+            current = next_val
+
+        return num_line
 
 
 SCENE_MAP = {
@@ -624,7 +1160,7 @@ SCENE_MAP = {
 
 
 def get_cache_filename(data):
-    key = f"{data['type']}_{data['operand1']}_{data['operand2']}_{data.get('style', 'default')}"
+    key = f"v{RENDER_VERSION}_{data['type']}_{data['operand1']}_{data['operand2']}_{data.get('style', 'default')}"
     hash_str = hashlib.md5(key.encode()).hexdigest()[:12]
     return f"math_viz_{hash_str}"
 
@@ -660,6 +1196,9 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
 
     output_file = os.path.join(output_dir, f"{cache_name}.mp4")
+    # Per-problem scratch directory so concurrent renders (e.g. a prefetch
+    # alongside a live request) never pick up or delete each other's files.
+    media_tmp = os.path.join(output_dir, "media_tmp", cache_name)
     if os.path.exists(output_file):
         print(json.dumps({
             "success": True,
@@ -668,13 +1207,18 @@ def main():
         }))
         return
 
+    # Cancelled prefetches and timed-out renders are stopped with SIGTERM; exit
+    # through the finally below so their partial movies are removed.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    shutil.rmtree(media_tmp, ignore_errors=True)
+
     try:
         tempconfig_kwargs = {
             "pixel_height": 720,
             "pixel_width": 1280,
             "frame_rate": 30,
             "output_file": cache_name,
-            "media_dir": os.path.join(output_dir, "media_tmp"),
+            "media_dir": media_tmp,
             "quality": "medium_quality",
             "disable_caching": True,
             "preview": False,
@@ -691,10 +1235,8 @@ def main():
 
             scene.render()
 
-        import shutil
-
         found_mp4 = None
-        for root, dirs, files in os.walk(os.path.join(output_dir, "media_tmp")):
+        for root, dirs, files in os.walk(media_tmp):
             for f in files:
                 if f.endswith(".mp4") and "partial" not in root:
                     found_mp4 = os.path.join(root, f)
@@ -703,7 +1245,7 @@ def main():
                 break
 
         if not found_mp4:
-            for root, dirs, files in os.walk(os.path.join(output_dir, "media_tmp")):
+            for root, dirs, files in os.walk(media_tmp):
                 for f in files:
                     if f.endswith(".mp4"):
                         found_mp4 = os.path.join(root, f)
@@ -724,9 +1266,6 @@ def main():
 
         if found_mp4:
             shutil.move(found_mp4, output_file)
-            media_tmp = os.path.join(output_dir, "media_tmp")
-            if os.path.exists(media_tmp):
-                shutil.rmtree(media_tmp, ignore_errors=True)
             if os.path.exists("media"):
                 shutil.rmtree("media", ignore_errors=True)
 
@@ -743,6 +1282,8 @@ def main():
         import traceback
         print(json.dumps({"error": str(e), "traceback": traceback.format_exc()}))
         sys.exit(1)
+    finally:
+        shutil.rmtree(media_tmp, ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -9,16 +9,20 @@ import {
   insertChatMessageSchema
 } from "@shared/schema";
 import { generateChatResponse, generateMathHelp, generateQuiz, evaluateQuizPerformance } from "./gemini";
+import {
+  sanitizeVisualizationProblem,
+  renderVisualization,
+  prefetchVisualizations,
+  cancelPrefetches,
+  getPrefetchStats,
+  type VisualizationProblem,
+} from "./visualization";
 import multer from "multer";
 import { PDFParse } from "pdf-parse";
-import { execFile } from "child_process";
-import { promisify } from "util";
 import path from "path";
 import fs from "fs";
 import express from "express";
 
-const execFileAsync = promisify(execFile);
-
 const upload = multer({ 
   storage: multer.memoryStorage(),
   limits: { fileSize: 10 * 1024 * 1024 },
@@ -650,64 +654,12 @@ export async function registerRoutes(
   // Math Visualization API - Generate Manim animation
   app.post("/api/math-visualization", async (req, res) => {
     try {
-      const { type, operand1, operand2, answer, style } = req.body;
-
-      if (!type || operand1 === undefined || operand2 === undefined || answer === undefined) {
-        return res.status(400).json({ error: "Missing required fields: type, operand1, operand2, answer" });
-      }
-
-      const validTypes = ["addition", "subtraction", "multiplication", "division"];
-      if (!validTypes.includes(type)) {
-        return res.status(400).json({ error: `Invalid type. Must be one of: ${validTypes.join(", ")}` });
-      }
-
-      if (typeof operand1 !== "number" || typeof operand2 !== "number" || typeof answer !== "number") {
-        return res.status(400).json({ error: "operand1, operand2, and answer must be numbers" });
+      const sanitized = sanitizeVisualizationProblem(req.body);
+      if ("error" in sanitized) {
+        return res.status(400).json({ error: sanitized.error });
       }
 
-      const validStyles = ["default", "numberline"];
-      const sanitizedStyle = validStyles.includes(style) ? style : "default";
-
-      const safeOp1 = Math.max(0, Math.min(1000, Math.abs(Math.floor(operand1))));
-      const safeOp2 = Math.max(0, Math.min(1000, Math.abs(Math.floor(operand2))));
-      const safeAnswer = Math.max(-1000, Math.min(10000, Math.floor(answer)));
-
-      const problemData = JSON.stringify({
-        type,
-        operand1: safeOp1,
-        operand2: safeOp2,
-        answer: safeAnswer,
-        style: sanitizedStyle,
-      });
-
-      const scriptPath = path.resolve(process.cwd(), "server", "manim", "render.py");
-
-      const { stdout, stderr } = await execFileAsync(
-        "python3",
-        [scriptPath, problemData],
-        { timeout: 90000, cwd: process.cwd() }
-      );
-
-      if (stderr) {
-        console.warn("Manim stderr:", stderr.slice(0, 500));
-      }
-
-      const trimmed = stdout.trim();
-      if (!trimmed) {
-        console.error("Manim render produced no output");
-        return res.status(500).json({ error: "Failed to generate visualization" });
-      }
-
-      const lines = trimmed.split("\n");
-      const lastLine = lines[lines.length - 1];
-
-      let result;
-      try {
-        result = JSON.parse(lastLine);
-      } catch {
-        console.error("Failed to parse Manim output:", lastLine.slice(0, 200));
-        return res.status(500).json({ error: "Failed to generate visualization" });
-      }
+      const result = await renderVisualization(sanitized.problem);
 
       if (result.error) {
         console.error("Manim render error:", result.error);
@@ -724,27 +676,64 @@ export async function registerRoutes(
     }
   });
 
+  // Math Visualization API - Pre-render the problem on screen and the next ones
+  app.post("/api/math-visualization/prefetch", async (req, res) => {
+    try {
+      const { clientId, problems, styles } = req.body;
+
+      if (typeof clientId !== "string" || clientId.length === 0 || clientId.length > 64) {
+        return res.status(400).json({ error: "clientId is required" });
+      }
+      if (!Array.isArray(problems) || problems.length === 0) {
+        return res.status(400).json({ error: "problems must be a non-empty array" });
+      }
+      if (styles !== undefined && (!Array.isArray(styles) || !styles.every(s => typeof s === "string"))) {
+        return res.status(400).json({ error: "styles must be an array of strings" });
+      }
+
+      const sanitizedProblems: VisualizationProblem[] = [];
+      for (const problem of problems) {
+        const sanitized = sanitizeVisualizationProblem(problem);
+        if ("error" in sanitized) {
+          return res.status(400).json({ error: sanitized.error });
+        }
+        sanitizedProblems.push(sanitized.problem);
+      }
+
+      const queued = prefetchVisualizations(clientId, sanitizedProblems, styles);
+      res.status(202).json({ queued });
+    } catch (error) {
+      console.error("Math visualization prefetch error:", error);
+      res.status(500).json({ error: "Failed to prefetch visualizations" });
+    }
+  });
+
+  app.delete("/api/math-visualization/prefetch/:clientId", async (req, res) => {
+    cancelPrefetches(req.params.clientId);
+    res.json({ success: true });
+  });
+
+  app.get("/api/math-visualization/prefetch/stats", async (_req, res) => {
+    res.json(getPrefetchStats());
+  });
+
   // Quiz API - Get user's quiz history
   app.get("/api/quiz/user/:userId", async (req, res) => {
     try {
       const { userId } = req.params;
-      const quizzes = await storage.getQuizzes(userId);
+      const quizzes = (await storage.getQuizzes(userId)).filter(q => q.completedAt);
       
-      // Get story titles for each quiz
-      const quizzesWithStories = await Promise.all(
-        quizzes.filter(q => q.completedAt).map(async (quiz) => {
-          const story = await storage.getStory(quiz.storyId);
-          return {
-            quizId: quiz.id,
-            storyId: quiz.storyId,
-            storyTitle: story?.title || "Unknown Story",
-            score: quiz.score,
-            totalQuestions: quiz.totalQuestions,
-            passed: quiz.passed,
-            completedAt: quiz.completedAt,
-          };
-        })
-      );
+      // Get story titles for all quizzes in one lookup
+      const stories = await storage.getStoriesByIds(Array.from(new Set(quizzes.map(q => q.storyId))));
+      const quizzesWithStories = quizzes.map((quiz) => ({
+        quizId: quiz.id,
+        storyId: quiz.storyId,
+        storyTitle: stories.get(quiz.storyId)?.title || "Unknown Story",
+        score: quiz.score,
+        totalQuestions: quiz.totalQuestions,
+        passed: quiz.passed,
+        completedAt: quiz.completedAt,
+      }));
 
       res.json(quizzesWithStories);
     } catch (error) {
@@ -36,6 +36,7 @@ export interface IStorage {
 
   getStories(): Promise<Story[]>;
   getStory(id: string): Promise<Story | undefined>;
+  getStoriesByIds(ids: string[]): Promise<Map<string, Story>>;
   createStory(story: InsertStory): Promise<Story>;
   deleteStory(id: string): Promise<void>;
 
@@ -57,6 +58,76 @@ export interface IStorage {
   }>;
 }
 
+const byTimeAsc = <T>(time: (record: T) => Date | string) =>
+  (a: T, b: T) => new Date(time(a)).getTime() - new Date(time(b)).getTime();
+const byTimeDesc = <T>(time: (record: T) => Date | string) =>
+  (a: T, b: T) => new Date(time(b)).getTime() - new Date(time(a)).getTime();
+const insertionOrder = () => 0;
+
+function compositeKey(...parts: string[]): string {
+  return parts.join("\u0000");
+}
+
+// Secondary index: records grouped by key, each group kept in `compare` order
+// as records are inserted (ties keep insertion order), so per-user lookups
+// never scan or re-sort the whole table.
+class OrderedIndex<T extends { id: string }> {
+  private groups = new Map<string, T[]>();
+
+  constructor(
+    private keyOf: (record: T) => string | null,
+    private compare: (a: T, b: T) => number,
+  ) {}
+
+  get(key: string): T[] {
+    return (this.groups.get(key) || []).slice();
+  }
+
+  first(key: string): T | undefined {
+    return this.groups.get(key)?.[0];
+  }
+
+  insert(record: T): void {
+    const key = this.keyOf(record);
+    if (key === null) return;
+    const group = this.groups.get(key) || [];
+    let lo = 0;
+    let hi = group.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (this.compare(group[mid], record) <= 0) {
+        lo = mid + 1;
+      } else {
+        hi = mid;
+      }
+    }
+    group.splice(lo, 0, record);
+    this.groups.set(key, group);
+  }
+
+  remove(record: T): void {
+    const key = this.keyOf(record);
+    if (key === null) return;
+    const group = this.groups.get(key);
+    if (!group) return;
+    const index = group.findIndex(r => r.id === record.id);
+    if (index !== -1) group.splice(index, 1);
+    if (group.length === 0) this.groups.delete(key);
+  }
+
+  replace(previous: T, updated: T): void {
+    const key = this.keyOf(previous);
+    const group = key === null ? undefined : this.groups.get(key);
+    const index = group ? group.findIndex(r => r.id === previous.id) : -1;
+    if (group && index !== -1 && key === this.keyOf(updated) && this.compare(previous, updated) === 0) {
+      group[index] = updated;
+      return;
+    }
+    this.remove(previous);
+    this.insert(updated);
+  }
+}
+
 export class MemStorage implements IStorage {
   private users: Map<string, User>;
   private sessions: Map<string, Session>;
@@ -67,6 +138,20 @@ export class MemStorage implements IStorage {
   private chatMessages: Map<string, ChatMessage>;
   private quizzes: Map<string, Quiz>;
 
+  private sessionsByUser = new OrderedIndex<Session>(s => s.userId, byTimeDesc(s => s.startTime));
+  private readingProgressByUser = new OrderedIndex<ReadingProgress>(r => r.userId, insertionOrder);
+  private readingProgressBySession = new OrderedIndex<ReadingProgress>(r => r.sessionId, insertionOrder);
+  private mathProgressByUser = new OrderedIndex<MathProgress>(m => m.userId, insertionOrder);
+  private mathProgressBySession = new OrderedIndex<MathProgress>(m => m.sessionId, insertionOrder);
+  private vibeStatesByUser = new OrderedIndex<VibeState>(v => v.userId, byTimeDesc(v => v.timestamp));
+  private vibeStatesBySession = new OrderedIndex<VibeState>(v => v.sessionId, byTimeAsc(v => v.timestamp));
+  private chatMessagesByUserStory = new OrderedIndex<ChatMessage>(
+    m => compositeKey(m.userId, m.storyId),
+    byTimeAsc(m => m.createdAt),
+  );
+  private quizzesByUser = new OrderedIndex<Quiz>(q => q.userId, byTimeDesc(q => q.createdAt));
+  private quizzesByUserStory = new OrderedIndex<Quiz>(q => compositeKey(q.userId, q.storyId), insertionOrder);
+
   constructor() {
     this.users = new Map();
     this.sessions = new Map();
@@ -186,7 +271,7 @@ The End.`,
         type: i % 2 === 0 ? "reading" : "math",
         duration: 15 + Math.floor(Math.random() * 10),
       };
-      this.sessions.set(session.id, session);
+      this.saveSession(session);
     }
 
     const readingProg: ReadingProgress = {
@@ -199,7 +284,7 @@ The End.`,
       currentPosition: 150,
       completed: false,
     };
-    this.readingProgress.set(readingProg.id, readingProg);
+    this.saveReadingProgress(readingProg);
 
     const mathProg: MathProgress = {
       id: "mp-1",
@@ -210,7 +295,7 @@ The End.`,
       currentLevel: 2,
       streak: 5,
     };
-    this.mathProgress.set(mathProg.id, mathProg);
+    this.saveMathProgress(mathProg);
 
     const vibes: VibeState[] = [
       { id: "vibe-1", userId: "user-1", sessionId: "session-0", state: "focused", timestamp: new Date(Date.now() - 3600000), notes: null },
@@ -218,7 +303,59 @@ The End.`,
       { id: "vibe-3", userId: "user-1", sessionId: "session-0", state: "confused", timestamp: new Date(Date.now() - 1800000), notes: null },
       { id: "vibe-4", userId: "user-1", sessionId: "session-0", state: "focused", timestamp: new Date(Date.now() - 900000), notes: null },
     ];
-    vibes.forEach(v => this.vibeStates.set(v.id, v));
+    vibes.forEach(v => this.saveVibeState(v));
+  }
+
+  private saveSession(session: Session): void {
+    const previous = this.sessions.get(session.id);
+    this.sessions.set(session.id, session);
+    if (previous) {
+      this.sessionsByUser.replace(previous, session);
+    } else {
+      this.sessionsByUser.insert(session);
+    }
+  }
+
+  private saveReadingProgress(progress: ReadingProgress): void {
+    const previous = this.readingProgress.get(progress.id);
+    this.readingProgress.set(progress.id, progress);
+    if (previous) {
+      this.readingProgressByUser.replace(previous, progress);
+      this.readingProgressBySession.replace(previous, progress);
+    } else {
+      this.readingProgressByUser.insert(progress);
+      this.readingProgressBySession.insert(progress);
+    }
+  }
+
+  private saveMathProgress(progress: MathProgress): void {
+    const previous = this.mathProgress.get(progress.id);
+    this.mathProgress.set(progress.id, progress);
+    if (previous) {
+      this.mathProgressByUser.replace(previous, progress);
+      this.mathProgressBySession.replace(previous, progress);
+    } else {
+      this.mathProgressByUser.insert(progress);
+      this.mathProgressBySession.insert(progress);
+    }
+  }
+
+  private saveVibeState(state: VibeState): void {
+    this.vibeStates.set(state.id, state);
+    this.vibeStatesByUser.insert(state);
+    this.vibeStatesBySession.insert(state);
+  }
+
+  private saveQuiz(quiz: Quiz): void {
+    const previous = this.quizzes.get(quiz.id);
+    this.quizzes.set(quiz.id, quiz);
+    if (previous) {
+      this.quizzesByUser.replace(previous, quiz);
+      this.quizzesByUserStory.replace(previous, quiz);
+    } else {
+      this.quizzesByUser.insert(quiz);
+      this.quizzesByUserStory.insert(quiz);
+    }
   }
 
   async getUser(id: string): Promise<User | undefined> {
@@ -244,9 +381,7 @@ The End.`,
   }
 
   async getSessions(userId: string): Promise<Session[]> {
-    return Array.from(this.sessions.values())
-      .filter(s => s.userId === userId)
-      .sort((a, b) => new Date(b.startTime).getTime() - new Date(a.startTime).getTime());
+    return this.sessionsByUser.get(userId);
   }
 
   async getSession(id: string): Promise<Session | undefined> {
@@ -262,7 +397,7 @@ The End.`,
       endTime: session.endTime || null,
       duration: session.duration || 0,
     };
-    this.sessions.set(id, newSession);
+    this.saveSession(newSession);
     return newSession;
   }
 
@@ -270,18 +405,16 @@ The End.`,
     const session = this.sessions.get(id);
     if (!session) return undefined;
     const updated = { ...session, ...updates };
-    this.sessions.set(id, updated);
+    this.saveSession(updated);
     return updated;
   }
 
   async getReadingProgress(userId: string): Promise<ReadingProgress[]> {
-    return Array.from(this.readingProgress.values())
-      .filter(r => r.userId === userId);
+    return this.readingProgressByUser.get(userId);
   }
 
   async getReadingProgressBySession(sessionId: string): Promise<ReadingProgress | undefined> {
-    return Array.from(this.readingProgress.values())
-      .find(r => r.sessionId === sessionId);
+    return this.readingProgressBySession.first(sessionId);
   }
 
   async createReadingProgress(progress: InsertReadingProgress): Promise<ReadingProgress> {
@@ -295,7 +428,7 @@ The End.`,
       currentPosition: progress.currentPosition || 0,
       completed: progress.completed || false,
     };
-    this.readingProgress.set(id, newProgress);
+    this.saveReadingProgress(newProgress);
     return newProgress;
   }
 
@@ -303,18 +436,16 @@ The End.`,
     const progress = this.readingProgress.get(id);
     if (!progress) return undefined;
     const updated = { ...progress, ...updates };
-    this.readingProgress.set(id, updated);
+    this.saveReadingProgress(updated);
     return updated;
   }
 
   async getMathProgress(userId: string): Promise<MathProgress[]> {
-    return Array.from(this.mathProgress.values())
-      .filter(m => m.userId === userId);
+    return this.mathProgressByUser.get(userId);
   }
 
   async getMathProgressBySession(sessionId: string): Promise<MathProgress | undefined> {
-    return Array.from(this.mathProgress.values())
-      .find(m => m.sessionId === sessionId);
+    return this.mathProgressBySession.first(sessionId);
   }
 
   async createMathProgress(progress: InsertMathProgress): Promise<MathProgress> {
@@ -328,7 +459,7 @@ The End.`,
       currentLevel: progress.currentLevel || 1,
       streak: progress.streak || 0,
     };
-    this.mathProgress.set(id, newProgress);
+    this.saveMathProgress(newProgress);
     return newProgress;
   }
 
@@ -336,20 +467,16 @@ The End.`,
     const progress = this.mathProgress.get(id);
     if (!progress) return undefined;
     const updated = { ...progress, ...updates };
-    this.mathProgress.set(id, updated);
+    this.saveMathProgress(updated);
     return updated;
   }
 
   async getVibeStates(userId: string): Promise<VibeState[]> {
-    return Array.from(this.vibeStates.values())
-      .filter(v => v.userId === userId)
-      .sort((a, b) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime());
+    return this.vibeStatesByUser.get(userId);
   }
 
   async getVibeStatesBySession(sessionId: string): Promise<VibeState[]> {
-    return Array.from(this.vibeStates.values())
-      .filter(v => v.sessionId === sessionId)
-      .sort((a, b) => new Date(a.timestamp).getTime() - new Date(b.timestamp).getTime());
+    return this.vibeStatesBySession.get(sessionId);
   }
 
   async createVibeState(state: InsertVibeState): Promise<VibeState> {
@@ -361,7 +488,7 @@ The End.`,
       timestamp: state.timestamp || new Date(),
       notes: state.notes || null,
     };
-    this.vibeStates.set(id, newState);
+    this.saveVibeState(newState);
     return newState;
   }
 
@@ -373,6 +500,15 @@ The End.`,
     return this.stories.get(id);
   }
 
+  async getStoriesByIds(ids: string[]): Promise<Map<string, Story>> {
+    const found = new Map<string, Story>();
+    for (const id of ids) {
+      const story = this.stories.get(id);
+      if (story) found.set(id, story);
+    }
+    return found;
+  }
+
   async createStory(story: InsertStory): Promise<Story> {
     const id = randomUUID();
     const newStory: Story = {
@@ -394,9 +530,7 @@ The End.`,
   }
 
   async getChatMessages(userId: string, storyId: string): Promise<ChatMessage[]> {
-    return Array.from(this.chatMessages.values())
-      .filter(m => m.userId === userId && m.storyId === storyId)
-      .sort((a, b) => new Date(a.createdAt).getTime() - new Date(b.createdAt).getTime());
+    return this.chatMessagesByUserStory.get(compositeKey(userId, storyId));
   }
 
   async createChatMessage(message: InsertChatMessage): Promise<ChatMessage> {
@@ -407,28 +541,24 @@ The End.`,
       createdAt: message.createdAt || new Date(),
     };
     this.chatMessages.set(id, newMessage);
+    this.chatMessagesByUserStory.insert(newMessage);
     return newMessage;
   }
 
   async clearChatMessages(userId: string, storyId: string): Promise<void> {
-    const keysToDelete: string[] = [];
-    this.chatMessages.forEach((msg, key) => {
-      if (msg.userId === userId && msg.storyId === storyId) {
-        keysToDelete.push(key);
-      }
+    const messages = this.chatMessagesByUserStory.get(compositeKey(userId, storyId));
+    messages.forEach(msg => {
+      this.chatMessages.delete(msg.id);
+      this.chatMessagesByUserStory.remove(msg);
     });
-    keysToDelete.forEach(key => this.chatMessages.delete(key));
   }
 
   async getQuizzes(userId: string): Promise<Quiz[]> {
-    return Array.from(this.quizzes.values())
-      .filter(q => q.userId === userId)
-      .sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime());
+    return this.quizzesByUser.get(userId);
   }
 
   async getQuizByStory(userId: string, storyId: string): Promise<Quiz | undefined> {
-    return Array.from(this.quizzes.values())
-      .find(q => q.userId === userId && q.storyId === storyId);
+    return this.quizzesByUserStory.first(compositeKey(userId, storyId));
   }
 
   async createQuiz(quiz: InsertQuiz): Promise<Quiz> {
@@ -442,7 +572,7 @@ The End.`,
       completedAt: quiz.completedAt || null,
       createdAt: quiz.createdAt || new Date(),
     };
-    this.quizzes.set(id, newQuiz);
+    this.saveQuiz(newQuiz);
     return newQuiz;
   }
 
@@ -450,7 +580,7 @@ The End.`,
     const quiz = this.quizzes.get(id);
     if (!quiz) return undefined;
     const updated = { ...quiz, ...updates };
-    this.quizzes.set(id, updated);
+    this.saveQuiz(updated);
     return updated;
   }
 
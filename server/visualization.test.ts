@@ -0,0 +1,185 @@
+import { test, before, after, afterEach, mock } from "node:test";
+import assert from "node:assert/strict";
+import childProcess from "child_process";
+import fs from "fs";
+import os from "os";
+import { syncBuiltinESMExports } from "module";
+import * as viz from "./visualization";
+
+// execFile is replaced by a fake render that the test finishes or that is
+// killed, so the scheduling and accounting run without manim.
+interface FakeRender {
+  problem: viz.VisualizationProblem;
+  pid: number;
+  done: boolean;
+  killed: boolean;
+  finish: () => void;
+}
+
+const renders: FakeRender[] = [];
+let nextPid = 900000;
+
+function fakeExecFile(_file: string, args: string[], _options: unknown, callback: Function) {
+  const problem = JSON.parse(args[1]);
+  const render: FakeRender = {
+    problem,
+    pid: nextPid++,
+    done: false,
+    killed: false,
+    finish() {
+      if (render.done) return;
+      render.done = true;
+      const result = { success: true, videoUrl: `/manim-cache/${problem.type}_${problem.operand1}_${problem.operand2}.mp4` };
+      callback(null, `${JSON.stringify(result)}\n`, "");
+    },
+  };
+  renders.push(render);
+  return {
+    pid: render.pid,
+    kill() {
+      if (render.done) return;
+      render.done = true;
+      render.killed = true;
+      callback(Object.assign(new Error("killed"), { killed: true, signal: "SIGTERM" }), "", "");
+    },
+  };
+}
+
+function problem(operand1: number, operand2: number): viz.VisualizationProblem {
+  const sanitized = viz.sanitizeVisualizationProblem({ type: "addition", operand1, operand2 });
+  assert.ok("problem" in sanitized);
+  return sanitized.problem;
+}
+
+function rendersOf(p: viz.VisualizationProblem): FakeRender[] {
+  return renders.filter(r =>
+    r.problem.type === p.type && r.problem.operand1 === p.operand1 &&
+    r.problem.operand2 === p.operand2 && r.problem.style === p.style
+  );
+}
+
+const settle = () => new Promise(resolve => setImmediate(resolve));
+
+const setPriority = mock.fn((_pid: number, _priority: number) => {
+  // What a non-root server gets when it tries to raise a priority back.
+  throw Object.assign(new Error("EACCES"), { code: "EACCES" });
+});
+
+before(() => {
+  mock.method(childProcess, "execFile", fakeExecFile);
+  syncBuiltinESMExports();
+  mock.method(os, "setPriority", setPriority);
+  const existsSync = fs.existsSync;
+  mock.method(fs, "existsSync", (file: fs.PathLike) => String(file).includes("manim-cache") || existsSync(file));
+});
+
+after(() => {
+  mock.restoreAll();
+  syncBuiltinESMExports();
+});
+
+afterEach(async () => {
+  for (const clientId of ["a", "b", "c", "d"]) {
+    viz.cancelPrefetches(clientId);
+  }
+  // Drain anything a test left running so the background slot is free.
+  while (renders.some(r => !r.done)) {
+    renders.filter(r => !r.done).forEach(r => r.finish());
+    await settle();
+  }
+});
+
+test("a live request after a completed prefetch is a hit", async () => {
+  const p = problem(11, 1);
+  const start = viz.getPrefetchStats();
+
+  assert.equal(viz.prefetchVisualizations("a", [p]), 1);
+  rendersOf(p)[0].finish();
+  await settle();
+
+  const result = await viz.renderVisualization(p);
+  const stats = viz.getPrefetchStats();
+  assert.equal(result.success, true);
+  assert.equal(result.cached, true);
+  assert.equal(rendersOf(p).length, 1);
+  assert.equal(stats.hits - start.hits, 1);
+  assert.equal(stats.misses - start.misses, 0);
+
+  // Serving the same video again is a plain cache hit, not prefetch work.
+  await viz.renderVisualization(p);
+  assert.equal(viz.getPrefetchStats().hits - start.hits, 1);
+  assert.equal(viz.getPrefetchStats().cached - start.cached, 1);
+});
+
+test("a live request joins a running prefetch even if it cannot be reniced", async () => {
+  const p = problem(12, 1);
+  const start = viz.getPrefetchStats();
+
+  viz.prefetchVisualizations("a", [p]);
+  const [render] = rendersOf(p);
+  const live = viz.renderVisualization(p);
+  await settle();
+  render.finish();
+
+  const result = await live;
+  const stats = viz.getPrefetchStats();
+  assert.equal(result.success, true);
+  assert.equal(render.killed, false);
+  assert.equal(rendersOf(p).length, 1);
+  assert.ok(setPriority.mock.calls.some(call => call.arguments[0] === render.pid && call.arguments[1] === 0));
+  assert.equal(stats.hits - start.hits, 1);
+  assert.equal(stats.misses - start.misses, 0);
+});
+
+test("changing one client's wanted set cancels only that client's prefetches", async () => {
+  const dropped = problem(21, 1);
+  const replacement = problem(22, 1);
+  const other = problem(23, 1);
+  const start = viz.getPrefetchStats();
+
+  viz.prefetchVisualizations("c", [dropped]);
+  viz.prefetchVisualizations("d", [other]);
+  const [running] = rendersOf(dropped);
+  assert.equal(rendersOf(other).length, 0);
+
+  viz.prefetchVisualizations("c", [replacement]);
+  await settle();
+  assert.equal(running.killed, true);
+
+  // The freed slot goes on to the other prefetches, one at a time.
+  for (let i = 0; i < 2; i++) {
+    const active = renders.filter(r => !r.done);
+    assert.equal(active.length, 1);
+    active[0].finish();
+    await settle();
+  }
+
+  assert.equal(rendersOf(other).length, 1);
+  assert.equal(rendersOf(other)[0].killed, false);
+  assert.equal(rendersOf(replacement).length, 1);
+  assert.equal(viz.getPrefetchStats().cancelled - start.cancelled, 1);
+});
+
+test("a live request with nothing prefetched is a miss", async () => {
+  const p = problem(31, 1);
+  const start = viz.getPrefetchStats();
+
+  const live = viz.renderVisualization(p);
+  await settle();
+  assert.equal(rendersOf(p).length, 1);
+  rendersOf(p)[0].finish();
+
+  assert.equal((await live).success, true);
+  const stats = viz.getPrefetchStats();
+  assert.equal(stats.misses - start.misses, 1);
+  assert.equal(stats.hits - start.hits, 0);
+});
+
+test("the answer is derived from the operands, not taken from the client", () => {
+  const sanitized = viz.sanitizeVisualizationProblem({ type: "addition", operand1: 13, operand2: 1, answer: 999999 });
+  assert.ok("problem" in sanitized);
+  assert.equal(sanitized.problem.answer, 14);
+
+  const division = viz.sanitizeVisualizationProblem({ type: "division", operand1: 7, operand2: 0 });
+  assert.ok("error" in division);
+});
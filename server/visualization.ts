@@ -0,0 +1,391 @@
+import { execFile, type ChildProcess } from "child_process";
+import os from "os";
+import path from "path";
+import fs from "fs";
+
+const RENDER_TIMEOUT_MS = 90000;
+const MAX_PREFETCH_PROBLEMS = 5;
+const MAX_READY_ENTRIES = 500;
+const PREFETCH_NICENESS = 10;
+const PREFETCH_CLIENT_TTL_MS = 30 * 60 * 1000;
+const MAX_OPERAND = 1000;
+
+export const VISUALIZATION_TYPES = ["addition", "subtraction", "multiplication", "division"];
+export const VISUALIZATION_STYLES = ["default", "numberline"];
+
+// Only these types have a distinct number line scene; the others render the
+// default scene for either style, so prefetching both would be wasted work.
+const NUMBERLINE_TYPES = ["addition", "subtraction"];
+
+export interface VisualizationProblem {
+  type: string;
+  operand1: number;
+  operand2: number;
+  answer: number;
+  style: string;
+}
+
+export interface VisualizationResult {
+  success?: boolean;
+  videoUrl?: string;
+  cached?: boolean;
+  error?: string;
+}
+
+interface RenderJob {
+  key: string;
+  problem: VisualizationProblem;
+  promise: Promise<VisualizationResult>;
+  child: ChildProcess | null;
+  prefetch: boolean;
+  // A live request is waiting on this render, so it must not be cancelled.
+  awaited: boolean;
+  cancelled: boolean;
+}
+
+interface ReadyEntry {
+  result: VisualizationResult;
+  // Produced by a prefetch and not yet served to a live request.
+  fromPrefetch: boolean;
+}
+
+interface PrefetchClient {
+  queue: VisualizationProblem[];
+  wanted: Set<string>;
+  lastSeen: number;
+}
+
+export function sanitizeVisualizationProblem(
+  body: any
+): { problem: VisualizationProblem } | { error: string } {
+  const { type, operand1, operand2, style } = body || {};
+
+  if (!type || operand1 === undefined || operand2 === undefined) {
+    return { error: "Missing required fields: type, operand1, operand2" };
+  }
+
+  if (!VISUALIZATION_TYPES.includes(type)) {
+    return { error: `Invalid type. Must be one of: ${VISUALIZATION_TYPES.join(", ")}` };
+  }
+
+  if (typeof operand1 !== "number" || typeof operand2 !== "number") {
+    return { error: "operand1 and operand2 must be numbers" };
+  }
+
+  const a = Math.max(0, Math.min(MAX_OPERAND, Math.abs(Math.floor(operand1))));
+  const b = Math.max(0, Math.min(MAX_OPERAND, Math.abs(Math.floor(operand2))));
+  if (type === "division" && b === 0) {
+    return { error: "Cannot divide by zero" };
+  }
+
+  // The answer is always derived from the operands. A client-supplied answer
+  // is ignored, so it can neither inflate the scene nor poison the video cache.
+  return {
+    problem: {
+      type,
+      operand1: a,
+      operand2: b,
+      answer: computeAnswer(type, a, b),
+      style: VISUALIZATION_STYLES.includes(style) ? style : "default",
+    },
+  };
+}
+
+function computeAnswer(type: string, a: number, b: number): number {
+  switch (type) {
+    case "addition":
+      return a + b;
+    case "subtraction":
+      return a - b;
+    case "multiplication":
+      return a * b;
+    default:
+      return Math.floor(a / b);
+  }
+}
+
+// Same fields as get_cache_filename in render.py, which names the output file
+// and scratch directory; the answer is derived from the operands.
+function problemKey(problem: VisualizationProblem): string {
+  return `${problem.type}_${problem.operand1}_${problem.operand2}_${problem.style}`;
+}
+
+// Background renders run one at a time and only while no foreground render
+// is in progress, so a child waiting on a video never competes with a guess.
+// Each client (one math page) has its own wanted set and queue; the single
+// background slot is shared round-robin between them.
+const inFlight = new Map<string, RenderJob>();
+const ready = new Map<string, ReadyEntry>();
+const prefetchClients = new Map<string, PrefetchClient>();
+let foregroundRenders = 0;
+let backgroundJob: RenderJob | null = null;
+
+// hits: live requests served by a prefetched render (done or joined while
+// running). misses: live requests that had to start their own render.
+// cached: live requests served by an earlier live render; not prefetch work.
+const prefetchStats = {
+  queued: 0,
+  completed: 0,
+  cancelled: 0,
+  hits: 0,
+  misses: 0,
+  cached: 0,
+};
+
+function runRender(problem: VisualizationProblem, prefetch: boolean): RenderJob {
+  const key = problemKey(problem);
+  const scriptPath = path.resolve(process.cwd(), "server", "manim", "render.py");
+  const job: RenderJob = {
+    key,
+    problem,
+    promise: Promise.resolve({}),
+    child: null,
+    prefetch,
+    awaited: !prefetch,
+    cancelled: false,
+  };
+
+  job.promise = new Promise<VisualizationResult>((resolve, reject) => {
+    job.child = execFile(
+      "python3",
+      [scriptPath, JSON.stringify(problem)],
+      { timeout: RENDER_TIMEOUT_MS, cwd: process.cwd() },
+      (error, stdout, stderr) => {
+        if (stderr) {
+          console.warn("Manim stderr:", stderr.slice(0, 500));
+        }
+        const trimmed = stdout.trim();
+        const lines = trimmed.split("\n");
+        const lastLine = lines[lines.length - 1];
+
+        if (trimmed) {
+          try {
+            return resolve(JSON.parse(lastLine));
+          } catch {
+            console.error("Failed to parse Manim output:", lastLine.slice(0, 200));
+          }
+        } else if (!error) {
+          console.error("Manim render produced no output");
+        }
+        if (error) {
+          return reject(error);
+        }
+        resolve({ error: "Failed to parse Manim output" });
+      }
+    );
+
+    if (prefetch && job.child.pid !== undefined) {
+      try {
+        os.setPriority(job.child.pid, PREFETCH_NICENESS);
+      } catch {
+        // Lowering priority is best effort; the render still runs.
+      }
+    }
+  });
+
+  inFlight.set(key, job);
+  job.promise
+    .then(result => {
+      if (result.success && result.videoUrl && !job.cancelled) {
+        // A prefetch someone already joined has been counted as a hit.
+        ready.set(key, { result, fromPrefetch: job.prefetch && !job.awaited });
+        if (ready.size > MAX_READY_ENTRIES) {
+          ready.delete(ready.keys().next().value!);
+        }
+      }
+    }, () => {})
+    .finally(() => {
+      if (inFlight.get(key) === job) {
+        inFlight.delete(key);
+      }
+      if (job === backgroundJob) {
+        backgroundJob = null;
+        if (!job.cancelled) {
+          prefetchStats.completed++;
+        }
+      }
+      pumpPrefetchQueue();
+    });
+
+  return job;
+}
+
+function nextPrefetch(): VisualizationProblem | undefined {
+  for (const [clientId, client] of Array.from(prefetchClients.entries())) {
+    while (client.queue.length > 0) {
+      const problem = client.queue.shift()!;
+      const key = problemKey(problem);
+      if (ready.has(key) || inFlight.has(key)) {
+        continue;
+      }
+      // Move this client to the back so the next slot goes to someone else.
+      prefetchClients.delete(clientId);
+      prefetchClients.set(clientId, client);
+      return problem;
+    }
+  }
+  return undefined;
+}
+
+function pumpPrefetchQueue(): void {
+  if (backgroundJob || foregroundRenders > 0) return;
+  const problem = nextPrefetch();
+  if (problem) {
+    backgroundJob = runRender(problem, true);
+  }
+}
+
+function isReadyOnDisk(result: VisualizationResult): boolean {
+  if (!result.videoUrl) return false;
+  return fs.existsSync(path.resolve(process.cwd(), "public", result.videoUrl.replace(/^\//, "")));
+}
+
+function isWantedByAnyClient(key: string): boolean {
+  return Array.from(prefetchClients.values()).some(client => client.wanted.has(key));
+}
+
+function cancelJob(job: RenderJob): void {
+  job.cancelled = true;
+  job.child?.kill();
+  prefetchStats.cancelled++;
+}
+
+// A live request joins a running prefetch instead of restarting it. Raising
+// the priority back is best effort: non-root processes usually cannot, and a
+// prefetch only starts while no live render is running, so it still finishes
+// sooner than a fresh render would.
+function promoteJob(job: RenderJob): void {
+  if (job.child?.pid !== undefined) {
+    try {
+      os.setPriority(job.child.pid, 0);
+    } catch {
+      // Keep the niced render; no other render runs beside it.
+    }
+  }
+  job.awaited = true;
+}
+
+export async function renderVisualization(problem: VisualizationProblem): Promise<VisualizationResult> {
+  const key = problemKey(problem);
+
+  const done = ready.get(key);
+  if (done && isReadyOnDisk(done.result)) {
+    if (done.fromPrefetch) {
+      prefetchStats.hits++;
+      done.fromPrefetch = false;
+    } else {
+      prefetchStats.cached++;
+    }
+    return { ...done.result, cached: true };
+  }
+  ready.delete(key);
+
+  const running = inFlight.get(key);
+  if (running && !running.cancelled) {
+    if (running.prefetch && !running.awaited) {
+      promoteJob(running);
+      prefetchStats.hits++;
+    } else {
+      prefetchStats.cached++;
+    }
+    return running.promise;
+  }
+
+  prefetchStats.misses++;
+  for (const client of Array.from(prefetchClients.values())) {
+    client.queue = client.queue.filter(p => problemKey(p) !== key);
+  }
+
+  foregroundRenders++;
+  try {
+    if (running) {
+      // A cancelled render of this problem is still exiting; it shares the
+      // scratch directory, so let it clean up before starting again.
+      await running.promise.catch(() => {});
+    }
+    return await runRender(problem, false).promise;
+  } finally {
+    foregroundRenders--;
+    pumpPrefetchQueue();
+  }
+}
+
+function cancelUnwanted(): void {
+  if (backgroundJob && !backgroundJob.awaited && !isWantedByAnyClient(backgroundJob.key)) {
+    cancelJob(backgroundJob);
+  }
+}
+
+function pruneIdleClients(now: number): void {
+  for (const [clientId, client] of Array.from(prefetchClients.entries())) {
+    if (now - client.lastSeen > PREFETCH_CLIENT_TTL_MS) {
+      prefetchStats.cancelled += client.queue.length;
+      prefetchClients.delete(clientId);
+    }
+  }
+}
+
+/**
+ * Queue low-priority renders for the problem on a client's screen and the
+ * next ones in its set, in the given styles ("default" always first). The
+ * client's earlier prefetches that are no longer wanted are dropped; other
+ * clients' prefetches are untouched. Returns the number queued.
+ */
+export function prefetchVisualizations(
+  clientId: string,
+  problems: VisualizationProblem[],
+  styles: string[] = ["default"]
+): number {
+  const now = Date.now();
+  pruneIdleClients(now);
+
+  const orderedStyles = ["default", ...styles.filter(style => style !== "default" && VISUALIZATION_STYLES.includes(style))];
+  const wanted: VisualizationProblem[] = [];
+  for (const style of orderedStyles) {
+    for (const problem of problems.slice(0, MAX_PREFETCH_PROBLEMS)) {
+      if (style !== "default" && !NUMBERLINE_TYPES.includes(problem.type)) {
+        continue;
+      }
+      wanted.push({ ...problem, style });
+    }
+  }
+
+  const previous = prefetchClients.get(clientId);
+  const client: PrefetchClient = { queue: [], wanted: new Set(wanted.map(problemKey)), lastSeen: now };
+  if (previous) {
+    prefetchStats.cancelled += previous.queue.filter(p => !client.wanted.has(problemKey(p))).length;
+  }
+  prefetchClients.set(clientId, client);
+  cancelUnwanted();
+
+  for (const problem of wanted) {
+    const key = problemKey(problem);
+    if (ready.has(key) || inFlight.has(key)) {
+      continue;
+    }
+    client.queue.push(problem);
+  }
+  const queued = client.queue.length;
+  prefetchStats.queued += queued;
+
+  pumpPrefetchQueue();
+  return queued;
+}
+
+export function cancelPrefetches(clientId: string): void {
+  const client = prefetchClients.get(clientId);
+  if (!client) return;
+  prefetchStats.cancelled += client.queue.length;
+  prefetchClients.delete(clientId);
+  cancelUnwanted();
+}
+
+export function getPrefetchStats() {
+  const requests = prefetchStats.hits + prefetchStats.misses;
+  const queuedProblems = Array.from(prefetchClients.values()).reduce((acc, c) => acc + c.queue.length, 0);
+  return {
+    ...prefetchStats,
+    pending: queuedProblems + (backgroundJob ? 1 : 0),
+    hitRate: requests > 0 ? prefetchStats.hits / requests : 0,
+  };
+}